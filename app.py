@@ -1,9 +1,15 @@
 # app.py - main entry file
 import streamlit as st
 from utils import get_student_by_login, get_officer_by_login
+from migrations import ensure_schema
+from profiling import call_site
+from student_profile import remember, current_profile
 
 st.set_page_config(page_title="Placement Portal", layout="wide")
 
+# create / upgrade tables and indexes once per server process
+ensure_schema()
+
 if "role" not in st.session_state:
     st.session_state.role = None
 if "user" not in st.session_state:
@@ -35,7 +41,7 @@ if st.session_state.role is None:
                 user = get_student_by_login(student_id, name, phone)
                 if user:
                     st.session_state.role = "Student"
-                    st.session_state.user = user
+                    remember(user)
                     st.success("Logged in as student.")
                     if hasattr(st, "rerun"):
                         st.rerun()
@@ -74,7 +80,14 @@ else:
     # route to pages
     if role == "Student":
         from pages.student_portal import show_student_portal
-        show_student_portal(user)
+        with call_site("student"):
+            # cheap version check; the full row is only re-read when it changed
+            user = current_profile()
+            if user is None:
+                st.warning("Your student record no longer exists.")
+                logout()
+            show_student_portal(user)
     else:
         from pages.officer_portal import show_officer_portal
-        show_officer_portal(user)
+        with call_site("officer"):
+            show_officer_portal(user)
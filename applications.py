@@ -0,0 +1,90 @@
+# applications.py - atomic, idempotent job application submission
+from mysql.connector import errors
+
+from db_connection import run_query, transaction
+import placement_summary
+
+# submit_application() outcomes
+SUBMITTED = "submitted"
+ALREADY_SUBMITTED = "already_submitted"   # same idempotency key seen before (retry / double submit)
+KEY_REUSED = "key_reused"                 # idempotency key already used for another student/job
+DUPLICATE = "duplicate"                   # student already applied to this job
+CLOSED = "closed"                         # past Application_Deadline
+FULL = "full"                             # every position already filled
+NOT_FOUND = "not_found"
+
+FILLED_STATUSES = ("Selected", "Placed")
+
+_DUPLICATE_KEY = 1062  # ER_DUP_ENTRY
+_DEADLOCK = 1213       # ER_LOCK_DEADLOCK: InnoDB rolled the whole transaction back
+DEADLOCK_RETRIES = 3
+
+# Job state as of this transaction's snapshot (plain consistent read, no locks)
+_JOB_STATE_SQL = f"""
+    SELECT j.Application_Deadline < CURDATE() AS is_closed,
+           (SELECT COUNT(*) FROM APPLICATION a
+            WHERE a.Job_ID = j.Job_ID
+              AND a.Application_Status IN ({', '.join(['%s'] * len(FILLED_STATUSES))})
+           ) >= COALESCE(j.Number_of_Positions, 1) AS is_full
+    FROM JOB_POSTING j
+    WHERE j.Job_ID = %s
+"""
+
+# The deadline is re-checked by the INSERT itself so a job that closes
+# between the read above and the write cannot take the row.
+_INSERT_SQL = """
+    INSERT INTO APPLICATION (Student_ID, Job_ID, Application_Date, Application_Status,
+                             Cover_Letter, Idempotency_Key)
+    SELECT %s, j.Job_ID, CURDATE(), 'Under Review', %s, %s
+    FROM JOB_POSTING j
+    WHERE j.Job_ID = %s
+      AND (j.Application_Deadline IS NULL OR j.Application_Deadline >= CURDATE())
+"""
+
+
+def submit_application(student_id, job_id, cover_letter=None, idempotency_key=None):
+    """
+    Apply `student_id` to `job_id` in one transaction and return an outcome
+    constant. Duplicates are rejected by the UNIQUE (Student_ID, Job_ID)
+    key rather than a prior SELECT, so concurrent submits for the same job
+    never block each other and at most one row per student is created.
+    Re-sending the same `idempotency_key` for the same student and job
+    returns ALREADY_SUBMITTED; a key already used for another job returns
+    KEY_REUSED, so callers should issue a new key per submission.
+    """
+    for attempt in range(DEADLOCK_RETRIES + 1):
+        try:
+            return _submit(student_id, job_id, cover_letter, idempotency_key)
+        except errors.DatabaseError as e:
+            # colliding inserts on the unique key can deadlock; the loser is safe to replay
+            if e.errno != _DEADLOCK or attempt == DEADLOCK_RETRIES:
+                raise
+
+
+def _submit(student_id, job_id, cover_letter, idempotency_key):
+    try:
+        with transaction() as tx:
+            placement_summary.lock_students(tx, [student_id])
+            state = tx.query(_JOB_STATE_SQL, FILLED_STATUSES + (job_id,))
+            if not state:
+                return NOT_FOUND
+            if state[0]["is_closed"]:
+                return CLOSED
+            if state[0]["is_full"]:
+                return FULL
+            if not tx.execute(_INSERT_SQL, (student_id, cover_letter, idempotency_key, job_id)):
+                return CLOSED  # deadline passed since the read
+            placement_summary.refresh_students(tx, [student_id])
+            return SUBMITTED
+    except errors.IntegrityError as e:
+        if e.errno != _DUPLICATE_KEY:
+            raise
+        # a replay violates both unique keys and MySQL names only one, so look the key up
+        if idempotency_key:
+            owner = run_query("SELECT Student_ID, Job_ID FROM APPLICATION WHERE Idempotency_Key=%s",
+                              (idempotency_key,), ttl=0)
+            if owner:
+                if (owner[0]["Student_ID"], owner[0]["Job_ID"]) == (student_id, job_id):
+                    return ALREADY_SUBMITTED
+                return KEY_REUSED
+        return DUPLICATE
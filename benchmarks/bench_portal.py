@@ -0,0 +1,680 @@
+# benchmarks/bench_portal.py - seed a synthetic dataset and replay portal query mixes under load
+"""
+Load test for the database access paths behind the two portals.
+
+    # 1. build a throwaway database (default: collegeplacementdb_bench)
+    python benchmarks/bench_portal.py seed --students 20000 --companies 200
+
+    # 2. replay page renders from 32 concurrent workers for 30 seconds
+    python benchmarks/bench_portal.py run --workers 32 --duration 30 --mix mixed
+
+    # 3. hundreds of students applying to one job at once (exit 1 on a broken invariant)
+    python benchmarks/bench_portal.py apply-storm --students 500 --workers 200 --pool-size 50
+
+    # 4. keep the numbers, then compare a later run against them
+    python benchmarks/bench_portal.py run --save benchmarks/baseline.json
+    python benchmarks/bench_portal.py run --compare benchmarks/baseline.json
+
+Every scenario issues exactly the statements of one page render, taken
+from the portal modules themselves, through the same db_connection pool,
+cache and profiler the app uses. Only DB_CONFIG["database"] is swapped.
+"""
+import argparse
+import datetime
+import json
+import logging
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mysql.connector  # noqa: E402
+
+from db_connection import (  # noqa: E402
+    DB_CONFIG, POOL_CONFIG, CACHE_CONFIG, FANOUT_CONFIG, get_connection, release_connection, run_query,
+    transaction, query_tracker, pool_stats, cache_stats, invalidate_tables,
+)
+
+APP_DATABASE = DB_CONFIG["database"]
+DEFAULT_DATABASE = f"{APP_DATABASE}_bench"
+BATCH_SIZE = 5000
+
+# tables rebuilt by `seed` (children first); PLACEMENT_OFFICER keeps the seeded admin
+SEEDED_TABLES = ["STATUS_EVENT", "PLACEMENT_SUMMARY", "ELIGIBILITY", "INTERVIEW", "APPLICATION", "JOB_POSTING", "COMPANY", "STUDENT"]
+
+BRANCHES = ["CSE", "ECE", "EEE", "ME", "CE", "IT", "AI"]
+LAST_NAMES = ["Sharma", "Rao", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Das", "Khan", "Singh"]
+INDUSTRIES = ["IT Services", "Product", "Finance", "Consulting", "Manufacturing", "Telecom"]
+CITIES = ["Bengaluru", "Hyderabad", "Pune", "Chennai", "Mumbai", "Delhi", "Remote"]
+ROLES = ["Software Engineer", "Data Analyst", "Associate Consultant", "Design Engineer",
+         "Systems Engineer", "Business Analyst", "SRE", "ML Engineer"]
+APPLICATION_STATUSES = ["Under Review", "Shortlisted", "Interview Scheduled", "Selected", "Rejected"]
+INTERVIEW_RESULTS = ["Pending", "Shortlisted", "Selected", "Rejected"]
+OFFICER_LOGIN = ("admin@college.com", "admin123")
+
+
+def _use_database(name, no_cache=False, pool_size=None, serial=False):
+    """Point db_connection at the benchmark database before the pool is created."""
+    DB_CONFIG["database"] = name
+    if pool_size:
+        POOL_CONFIG["size"] = pool_size
+    if no_cache:
+        CACHE_CONFIG["max_entries"] = 0   # every put is evicted immediately
+    if serial:
+        FANOUT_CONFIG["max_workers"] = 0  # gather() runs its calls one by one
+    # benchmarks run outside `streamlit run`; silence the missing-runtime warnings
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+# ---------------- SEEDING ---------------- #
+def _create_database(name):
+    config = {k: v for k, v in DB_CONFIG.items() if k != "database"}
+    conn = mysql.connector.connect(**config)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{name}`")
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def _truncate():
+    conn = get_connection()
+    if not conn:
+        raise SystemExit("could not connect to the benchmark database")
+    cursor = conn.cursor()
+    try:
+        # session setting: the connection is discarded below rather than returned with it
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in SEEDED_TABLES:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    finally:
+        cursor.close()
+        release_connection(conn, discard=True)
+    invalidate_tables(None)
+
+
+def _insert(sql, rows):
+    """executemany in BATCH_SIZE chunks, one transaction per chunk."""
+    for i in range(0, len(rows), BATCH_SIZE):
+        with transaction() as tx:
+            tx.executemany(sql, rows[i:i + BATCH_SIZE])
+    return len(rows)
+
+
+def student_credentials(student_id):
+    """First_Name / Phone pair the seeded student logs in with."""
+    return f"Student{student_id}", f"9{student_id:09d}"
+
+
+def generate(students, companies, jobs_per_company, apps_per_student, interview_rate, seed):
+    """Deterministic synthetic rows for every seeded table, keyed by table name."""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    year = today.year
+
+    company_rows = [
+        (cid, f"Company {cid}", rng.choice(["Private", "MNC", "Startup", "PSU"]), f"8{cid:09d}",
+         rng.choice(INDUSTRIES), f"hr@company{cid}.example", f"https://company{cid}.example",
+         rng.choice(CITIES))
+        for cid in range(1, companies + 1)
+    ]
+
+    job_rows = []
+    for cid in range(1, companies + 1):
+        for _ in range(jobs_per_company):
+            jid = len(job_rows) + 1
+            branches = None if rng.random() < 0.4 else ",".join(sorted(rng.sample(BRANCHES, rng.randint(1, 3))))
+            job_rows.append((
+                jid, cid, rng.choice(ROLES), f"Synthetic job {jid}",
+                rng.randrange(300000, 4000000, 50000), rng.choice(CITIES),
+                rng.choice([0, 6.0, 6.5, 7.0, 7.5, 8.0]),
+                today + datetime.timedelta(days=rng.randint(-30, 90)), rng.randint(1, 20),
+                branches, rng.choice([None, 0, 1, 2]), rng.choice([None, year, year + 1]),
+                int(rng.random() < 0.2),
+            ))
+
+    student_rows = []
+    for sid in range(1, students + 1):
+        first, phone = student_credentials(sid)
+        student_rows.append((
+            sid, first, rng.choice(LAST_NAMES), f"student{sid}@college.example", phone,
+            round(rng.uniform(5.0, 10.0), 2), "Pending", rng.choice(BRANCHES),
+            rng.choice([0, 0, 0, 1, 2]), rng.choice([year, year + 1]),
+        ))
+
+    application_rows, interview_rows, event_rows = [], [], []
+    job_ids = range(1, len(job_rows) + 1)
+    for sid in range(1, students + 1):
+        count = min(len(job_rows), rng.randint(0, 2 * apps_per_student))
+        for jid in rng.sample(job_ids, count):
+            aid = len(application_rows) + 1
+            applied = today - datetime.timedelta(days=rng.randint(0, 180))
+            status = rng.choice(APPLICATION_STATUSES)
+            application_rows.append((aid, sid, jid, applied, status, "Synthetic cover letter"))
+            if status != "Under Review":  # the officer moved it on at some point
+                event_rows.append((len(event_rows) + 1, sid, "application", aid, None,
+                                   f"Application for job {jid} is now {status}", int(rng.random() < 0.9)))
+            if rng.random() < interview_rate:
+                for n in range(rng.randint(1, 3)):
+                    iid = len(interview_rows) + 1
+                    result = rng.choice(INTERVIEW_RESULTS)
+                    interview_rows.append((
+                        iid, aid, applied + datetime.timedelta(days=7 * (n + 1)),
+                        ["Aptitude", "Technical", "HR"][n], result,
+                    ))
+                    event_rows.append((len(event_rows) + 1, sid, "interview_result", aid, iid,
+                                       f"Result for job {jid}: {result}", int(rng.random() < 0.9)))
+
+    return {
+        "COMPANY": company_rows,
+        "JOB_POSTING": job_rows,
+        "STUDENT": student_rows,
+        "APPLICATION": application_rows,
+        "INTERVIEW": interview_rows,
+        "STATUS_EVENT": event_rows,
+    }
+
+
+INSERTS = {
+    "COMPANY": """INSERT INTO COMPANY (Company_ID, Company_Name, Company_Type, Phone, Industry_Type,
+                                       Email, Website, Address)
+                  VALUES (%s,%s,%s,%s,%s,%s,%s,%s)""",
+    "JOB_POSTING": """INSERT INTO JOB_POSTING (Job_ID, Company_ID, Job_Title, Job_Description, Salary_Package,
+                                               Location, Minimum_CGPA, Application_Deadline, Number_of_Positions,
+                                               Eligible_Branches, Max_Backlogs, Graduation_Year, Allow_Placed)
+                      VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+    "STUDENT": """INSERT INTO STUDENT (Student_ID, First_Name, Last_Name, Email, Phone, CGPA, Placement_Status,
+                                       Branch, Backlogs, Graduation_Year)
+                  VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+    "APPLICATION": """INSERT INTO APPLICATION (Application_ID, Student_ID, Job_ID, Application_Date,
+                                               Application_Status, Cover_Letter)
+                      VALUES (%s,%s,%s,%s,%s,%s)""",
+    "INTERVIEW": """INSERT INTO INTERVIEW (Interview_ID, Application_ID, Interview_Date, Interview_Round, Result)
+                    VALUES (%s,%s,%s,%s,%s)""",
+    "STATUS_EVENT": """INSERT INTO STATUS_EVENT (Event_ID, Student_ID, Kind, Application_ID, Interview_ID,
+                                                 Message, Seen)
+                       VALUES (%s,%s,%s,%s,%s,%s,%s)""",
+}
+
+
+def seed(args):
+    from migrations import migrate
+    from eligibility import rebuild
+    import placement_summary
+
+    _create_database(args.database)
+    applied = migrate()
+    print(f"schema ready (applied migrations: {applied or 'none'})")
+    _truncate()
+
+    started = time.perf_counter()
+    data = generate(args.students, args.companies, args.jobs_per_company,
+                    args.apps_per_student, args.interview_rate, args.seed)
+    for table in ["COMPANY", "JOB_POSTING", "STUDENT", "APPLICATION", "INTERVIEW", "STATUS_EVENT"]:
+        t0 = time.perf_counter()
+        n = _insert(INSERTS[table], data[table])
+        print(f"  {table:<12} {n:>9} rows  {time.perf_counter() - t0:6.1f}s")
+    t0 = time.perf_counter()
+    with transaction() as tx:
+        rebuild(tx)
+    pairs = run_query("SELECT COUNT(*) AS n FROM ELIGIBILITY", ttl=0)[0]["n"]
+    print(f"  {'ELIGIBILITY':<12} {pairs:>9} rows  {time.perf_counter() - t0:6.1f}s")
+    t0 = time.perf_counter()
+    with transaction() as tx:
+        # also aligns STUDENT.Placement_Status (and eligibility) with the seeded applications
+        placement_summary.rebuild(tx)
+    summaries = run_query("SELECT COUNT(*) AS n FROM PLACEMENT_SUMMARY", ttl=0)[0]["n"]
+    print(f"  {'SUMMARY':<12} {summaries:>9} rows  {time.perf_counter() - t0:6.1f}s")
+    print(f"seeded {args.database} in {time.perf_counter() - started:.1f}s")
+
+
+# ---------------- SCENARIOS ---------------- #
+# Each scenario replays the statements of one page render for a random user.
+class Dataset:
+    """ID ranges of the seeded data, read once before the run."""
+
+    def __init__(self):
+        counts = run_query("""
+            SELECT (SELECT MAX(Student_ID) FROM STUDENT) AS students,
+                   (SELECT MAX(Job_ID) FROM JOB_POSTING) AS jobs,
+                   (SELECT MAX(Event_ID) FROM STATUS_EVENT) AS events
+        """, ttl=0)[0]
+        self.students = counts["students"] or 0
+        self.jobs = counts["jobs"] or 0
+        self.events = counts["events"] or 0
+        if not self.students or not self.jobs:
+            raise SystemExit("benchmark database is empty - run `seed` first")
+
+
+def student_login(rng, data):
+    from utils import get_student_by_login
+    sid = rng.randint(1, data.students)
+    if get_student_by_login(sid, *student_credentials(sid)) is None:
+        raise RuntimeError(f"student {sid} failed to log in")
+
+
+def student_dashboard(rng, data):
+    from pages.student_portal import load_dashboard
+    load_dashboard(rng.randint(1, data.students))
+
+
+def student_rerender(rng, data):
+    """A later render of an open dashboard with no new status events."""
+    from pages.student_portal import refresh_dashboard
+    refresh_dashboard(rng.randint(1, data.students), {"cursor": data.events, "inbox": []})
+
+
+def student_search(rng, data):
+    from job_search import get_search_index
+    index = get_search_index()
+    index.refresh()
+    words = rng.choice(ROLES).lower().split()
+    if rng.random() < 0.3:  # a typo: swap two adjacent letters of the first word
+        w = words[0]
+        i = rng.randrange(len(w) - 1) if len(w) > 1 else 0
+        words[0] = w[:i] + w[i + 1:i + 2] + w[i:i + 1] + w[i + 2:]
+    index.search(" ".join(words), locations=[rng.choice(CITIES)] if rng.random() < 0.3 else None)
+
+
+def officer_login(rng, data):
+    from utils import get_officer_by_login
+    if get_officer_by_login(*OFFICER_LOGIN) is None:
+        raise RuntimeError("officer failed to log in")
+
+
+def _first_page(list_def, filters=None, page_size=50):
+    """What show_paginated() runs for the default sort and first page."""
+    from pagination import Filters, load_page
+    load_page(list_def["from_sql"], list_def["columns"], filters or Filters(),
+              next(iter(list_def["sort_options"].values())), list_def["key_column"],
+              descending=True, page_size=page_size)
+
+
+def officer_applications(rng, data):
+    from pages.officer_portal import COMPANY_OPTIONS_SQL, APPLICATIONS_LIST
+    run_query(COMPANY_OPTIONS_SQL, ttl=300)
+    _first_page(APPLICATIONS_LIST)
+
+
+def officer_interviews(rng, data):
+    from pages.officer_portal import COMPANY_OPTIONS_SQL, INTERVIEWS_LIST
+    run_query(COMPANY_OPTIONS_SQL, ttl=300)
+    _first_page(INTERVIEWS_LIST)
+
+
+def officer_students(rng, data):
+    from pagination import Filters, name_filter
+    from pages.officer_portal import STUDENTS_LIST
+    filters = Filters()
+    if rng.random() < 0.5:  # half the renders search by name prefix
+        name_filter(filters, rng.choice(LAST_NAMES)[:3], "s.Student_ID", "s.First_Name", "s.Last_Name")
+    if rng.random() < 0.5:  # and half filter by placement status
+        filters.add("p.Current_Status = %s", rng.choice(["Placed", "Not Placed", "Pending"]))
+    _first_page(STUDENTS_LIST, filters)
+
+
+def officer_jobs(rng, data):
+    from pagination import Filters
+    from pages.officer_portal import JOB_POSTINGS_SQL, ELIGIBLE_STUDENTS_LIST
+    run_query(JOB_POSTINGS_SQL)
+    _first_page(ELIGIBLE_STUDENTS_LIST, Filters().add("e.Job_ID = %s", rng.randint(1, data.jobs)))
+
+
+def officer_companies(rng, data):
+    from pages.officer_portal import COMPANIES_SQL
+    run_query(COMPANIES_SQL)
+
+
+SCENARIOS = {
+    "student_login": student_login,
+    "student_dashboard": student_dashboard,
+    "student_rerender": student_rerender,
+    "student_search": student_search,
+    "officer_login": officer_login,
+    "officer_applications": officer_applications,
+    "officer_interviews": officer_interviews,
+    "officer_students": officer_students,
+    "officer_jobs": officer_jobs,
+    "officer_companies": officer_companies,
+}
+
+# relative weights of page renders; "mixed" is ~90% student traffic
+MIXES = {
+    "student": {"student_login": 1, "student_dashboard": 3, "student_rerender": 6, "student_search": 3},
+    "officer": {"officer_login": 1, "officer_applications": 3, "officer_interviews": 3,
+                "officer_students": 2, "officer_jobs": 2, "officer_companies": 1},
+}
+MIXES["mixed"] = {
+    **{name: w * 9 for name, w in MIXES["student"].items()},
+    **{name: w * 10 / sum(MIXES["officer"].values()) for name, w in MIXES["officer"].items()},
+}
+MIXES.update({name: {name: 1} for name in SCENARIOS})
+
+
+# ---------------- RUNNER ---------------- #
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def _summarize(samples, elapsed):
+    ms = sorted(s[0] for s in samples)
+    queries = sum(s[1] for s in samples)
+    return {
+        "renders": len(ms),
+        "throughput_rps": round(len(ms) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ms, 0.50), 2) if ms else None,
+        "p95_ms": round(percentile(ms, 0.95), 2) if ms else None,
+        "p99_ms": round(percentile(ms, 0.99), 2) if ms else None,
+        "max_ms": round(ms[-1], 2) if ms else None,
+        "queries_per_render": round(queries / len(ms), 2) if ms else None,
+    }
+
+
+def run(args):
+    from profiling import call_site, get_profiler
+
+    data = Dataset()
+    mix = MIXES[args.mix]
+    names, weights = list(mix), list(mix.values())
+    warmup_until = time.perf_counter() + args.warmup
+    deadline = warmup_until + args.duration
+    samples = {name: [] for name in names}
+    errors = {}
+    lock = threading.Lock()
+
+    def worker(n):
+        rng = random.Random(args.seed + n)
+        local = {name: [] for name in names}
+        local_errors = {}
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            name = rng.choices(names, weights)[0]
+            try:
+                with call_site("bench", name), query_tracker() as render:
+                    SCENARIOS[name](rng, data)
+            except Exception as e:  # keep going; a failing render is part of the result
+                key = f"{name}: {type(e).__name__}: {e}"
+                local_errors[key] = local_errors.get(key, 0) + 1
+                continue
+            if now >= warmup_until:
+                local[name].append((render["total_ms"], render["queries"], render["cache_hits"]))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+            for key, count in local_errors.items():
+                errors[key] = errors.get(key, 0) + count
+
+    get_profiler().reset()
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(args.workers)]
+    print(f"{args.workers} workers, mix={args.mix}, warmup {args.warmup}s, measuring {args.duration}s ...")
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    everything = [s for values in samples.values() for s in values]
+    return {
+        "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": {
+            "database": DB_CONFIG["database"], "workers": args.workers, "mix": args.mix,
+            "duration_s": args.duration, "warmup_s": args.warmup, "pool_size": POOL_CONFIG["size"],
+            "cache": CACHE_CONFIG["max_entries"] > 0, "fanout_workers": FANOUT_CONFIG["max_workers"],
+            "students": data.students, "jobs": data.jobs,
+        },
+        "overall": _summarize(everything, args.duration),
+        "scenarios": {name: _summarize(values, args.duration) for name, values in samples.items() if values},
+        "errors": errors,
+        "pool": pool_stats(),
+        "cache": cache_stats(),
+        "top_statements": [
+            {k: s[k] for k in ("statement", "calls", "avg_ms", "p95_ms", "max_ms", "avg_acquire_ms")}
+            for s in get_profiler().summary()[:10]
+        ],
+    }
+
+
+# ---------------- APPLY STORM ---------------- #
+def apply_storm(args):
+    """
+    Every student submits to one freshly posted job at the same instant,
+    plus a replay with the same idempotency key and a second submit with a
+    new key, all shuffled across workers. Verifies exactly one row and one
+    SUBMITTED outcome per student, then the deadline and capacity checks.
+    Returns (report, failures).
+    """
+    import uuid
+    import applications as app
+    import placement_summary
+
+    data = Dataset()
+    students = list(range(1, min(args.students, data.students) + 1))
+    with transaction() as tx:
+        tx.execute("""
+            INSERT INTO JOB_POSTING (Company_ID, Job_Title, Application_Deadline, Number_of_Positions)
+            SELECT MIN(Company_ID), 'Apply storm', CURDATE() + INTERVAL 1 DAY, 1 FROM COMPANY
+        """)
+        job_id = tx.lastrowid
+
+    tasks = []
+    for sid in students:
+        key = uuid.uuid4().hex
+        tasks += [(sid, key), (sid, key), (sid, uuid.uuid4().hex)]
+    random.Random(args.seed).shuffle(tasks)
+    shares = [tasks[n::args.workers] for n in range(args.workers)]
+    outcomes, latencies, failures = [], [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.workers)
+
+    def worker(share):
+        local = []
+        barrier.wait()
+        for sid, key in share:
+            t0 = time.perf_counter()
+            try:
+                outcome = app.submit_application(sid, job_id, "storm", key)
+            except Exception as e:
+                outcome = f"error: {type(e).__name__}: {e}"
+            local.append((sid, outcome, (time.perf_counter() - t0) * 1000))
+        with lock:
+            outcomes.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(share,), daemon=True) for share in shares]
+    print(f"{len(tasks)} submits for {len(students)} students from {args.workers} workers -> job {job_id} ...")
+    started = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        latencies = sorted(o[2] for o in outcomes)
+
+        counts = {}
+        submitted = {}
+        for sid, outcome, _ in outcomes:
+            counts[outcome] = counts.get(outcome, 0) + 1
+            if outcome == app.SUBMITTED:
+                submitted[sid] = submitted.get(sid, 0) + 1
+        rows = run_query("""
+            SELECT COUNT(*) AS total, COUNT(DISTINCT Student_ID) AS students
+            FROM APPLICATION WHERE Job_ID=%s
+        """, (job_id,), ttl=0)[0]
+        if rows["total"] != len(students) or rows["students"] != len(students):
+            failures.append(f"expected {len(students)} applications, found {rows['total']} "
+                            f"for {rows['students']} students")
+        if len(submitted) != len(students) or any(n != 1 for n in submitted.values()):
+            failures.append(f"{len(submitted)} students got SUBMITTED (expected {len(students)}, once each)")
+        unexpected = {k: v for k, v in counts.items() if k not in (app.SUBMITTED, app.ALREADY_SUBMITTED, app.DUPLICATE)}
+        if unexpected:
+            failures.append(f"unexpected outcomes: {unexpected}")
+
+        # capacity and deadline are checked before the insert, so any student will do
+        with transaction() as tx:
+            tx.execute("UPDATE APPLICATION SET Application_Status='Selected' WHERE Job_ID=%s AND Student_ID=%s",
+                       (job_id, students[0]))
+        if app.submit_application(students[-1], job_id) != app.FULL:
+            failures.append("submit to a job with every position filled was not rejected as FULL")
+        with transaction() as tx:
+            tx.execute("UPDATE JOB_POSTING SET Number_of_Positions=%s, Application_Deadline=CURDATE() - INTERVAL 1 DAY "
+                       "WHERE Job_ID=%s", (len(students) + 10, job_id))
+        if app.submit_application(students[-1], job_id) != app.CLOSED:
+            failures.append("submit after the deadline was not rejected as CLOSED")
+    finally:
+        with transaction() as tx:
+            placement_summary.lock_students(tx, students)
+            tx.execute("DELETE FROM APPLICATION WHERE Job_ID=%s", (job_id,))
+            tx.execute("DELETE FROM JOB_POSTING WHERE Job_ID=%s", (job_id,))
+            placement_summary.refresh_students(tx, students)
+
+    report = {
+        "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": {"database": DB_CONFIG["database"], "workers": args.workers,
+                   "students": len(students), "pool_size": POOL_CONFIG["size"]},
+        "submits": len(outcomes),
+        "throughput_rps": round(len(outcomes) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99), 2) if latencies else None,
+        "max_ms": round(latencies[-1], 2) if latencies else None,
+        "outcomes": counts,
+        "pool": pool_stats(),
+    }
+    return report, failures
+
+
+# ---------------- REPORTING ---------------- #
+COLUMNS = ["renders", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms", "queries_per_render"]
+
+
+def print_report(report):
+    rows = [("overall", report["overall"])] + list(report["scenarios"].items())
+    print(f"\n{'scenario':<22}" + "".join(f"{c:>20}" for c in COLUMNS))
+    for name, stats in rows:
+        print(f"{name:<22}" + "".join(f"{str(stats[c]):>20}" for c in COLUMNS))
+    pool, cache = report["pool"], report["cache"]
+    print(f"\npool: {pool}")
+    print(f"cache hit rate: {cache['hit_rate']}  ({cache['hits']} hits / {cache['misses']} misses)")
+    for key, count in report["errors"].items():
+        print(f"ERROR x{count}: {key}")
+
+
+def _delta(new, old, lower_is_better):
+    """Signed % change, positive meaning worse."""
+    if new is None or not old:
+        return None
+    change = (new - old) / old * 100
+    return change if lower_is_better else -change
+
+
+def compare(report, baseline, threshold):
+    """Print per-scenario changes; returns the list of regressions beyond `threshold` %."""
+    regressions = []
+    print(f"\ncompared with baseline recorded {baseline.get('recorded_at')} "
+          f"(positive = worse, threshold {threshold}%)")
+    print(f"{'scenario':<22}{'throughput':>14}{'p50':>10}{'p95':>10}{'p99':>10}")
+    rows = [("overall", report["overall"], baseline["overall"])] + [
+        (name, stats, baseline["scenarios"][name])
+        for name, stats in report["scenarios"].items() if name in baseline.get("scenarios", {})
+    ]
+    for name, new, old in rows:
+        deltas = {
+            "throughput_rps": _delta(new["throughput_rps"], old["throughput_rps"], lower_is_better=False),
+            "p50_ms": _delta(new["p50_ms"], old["p50_ms"], lower_is_better=True),
+            "p95_ms": _delta(new["p95_ms"], old["p95_ms"], lower_is_better=True),
+            "p99_ms": _delta(new["p99_ms"], old["p99_ms"], lower_is_better=True),
+        }
+        print(f"{name:<22}" + "".join(
+            f"{'n/a' if d is None else f'{d:+.1f}%':>{w}}"
+            for d, w in zip(deltas.values(), (14, 10, 10, 10))
+        ))
+        for metric in ("throughput_rps", "p95_ms"):
+            if deltas[metric] is not None and deltas[metric] > threshold:
+                regressions.append(f"{name} {metric} {deltas[metric]:+.1f}%")
+    if report["config"] != baseline.get("config"):
+        print("note: run configuration differs from the baseline's")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the portal's database access paths.")
+    parser.add_argument("--database", default=DEFAULT_DATABASE,
+                        help=f"database to seed/benchmark (default {DEFAULT_DATABASE}; never the app's)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_seed = sub.add_parser("seed", help="(re)create the synthetic dataset")
+    p_seed.add_argument("--students", type=int, default=5000)
+    p_seed.add_argument("--companies", type=int, default=100)
+    p_seed.add_argument("--jobs-per-company", type=int, default=5)
+    p_seed.add_argument("--apps-per-student", type=int, default=5, help="average applications per student")
+    p_seed.add_argument("--interview-rate", type=float, default=0.4, help="share of applications interviewed")
+    p_seed.add_argument("--seed", type=int, default=42)
+
+    p_storm = sub.add_parser("apply-storm", help="concurrent submits to one job; checks duplicates/capacity")
+    p_storm.add_argument("--students", type=int, default=300, help="distinct students hitting the job")
+    p_storm.add_argument("--workers", type=int, default=100)
+    p_storm.add_argument("--pool-size", type=int, help="override POOL_CONFIG['size']")
+    p_storm.add_argument("--seed", type=int, default=42)
+    p_storm.add_argument("--save", help="write the report JSON here")
+
+    p_run = sub.add_parser("run", help="replay a query mix from concurrent workers")
+    p_run.add_argument("--workers", type=int, default=16)
+    p_run.add_argument("--duration", type=float, default=30, help="measured seconds")
+    p_run.add_argument("--warmup", type=float, default=3, help="seconds discarded before measuring")
+    p_run.add_argument("--mix", choices=list(MIXES), default="mixed")
+    p_run.add_argument("--pool-size", type=int, help="override POOL_CONFIG['size']")
+    p_run.add_argument("--no-cache", action="store_true", help="disable the shared query cache")
+    p_run.add_argument("--serial", action="store_true", help="run gather() fan-outs one query at a time")
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--save", help="write the report JSON here (e.g. a new baseline)")
+    p_run.add_argument("--compare", help="baseline report JSON to compare against")
+    p_run.add_argument("--threshold", type=float, default=10.0,
+                       help="%% change in throughput/p95 counted as a regression (exit code 1)")
+    args = parser.parse_args(argv)
+
+    if args.database == APP_DATABASE:
+        parser.error("refusing to seed/benchmark the application database; pick another --database")
+    _use_database(args.database, getattr(args, "no_cache", False), getattr(args, "pool_size", None),
+                  getattr(args, "serial", False))
+
+    if args.command == "seed":
+        seed(args)
+        return 0
+    if args.command == "apply-storm":
+        report, failures = apply_storm(args)
+        print(json.dumps(report, indent=2, default=str))
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump(dict(report, failures=failures), f, indent=2, default=str)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        print("apply-storm: " + ("FAILED" if failures else "all invariants held"))
+        return 1 if failures else 0
+
+    report = run(args)
+    print_report(report)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nreport saved to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print("REGRESSIONS: " + "; ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
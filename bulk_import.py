@@ -0,0 +1,199 @@
+# bulk_import.py - CSV/Excel roster import for officers
+import time
+
+import pandas as pd
+
+from db_connection import run_query, transaction
+from eligibility import (
+    normalize_branches, refresh_students, refresh_students_from, refresh_jobs_from,
+)
+import placement_summary
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _refresh_student_eligibility(tx, columns, chunk, first_id):
+    if "Student_ID" in columns:
+        pos = columns.index("Student_ID")
+        ids = [row[pos] for row in chunk]
+        placement_summary.refresh_students(tx, ids)
+        refresh_students(tx, ids)
+    else:
+        # auto-increment ids of one multi-row INSERT start at lastrowid
+        placement_summary.refresh_students_from(tx, first_id)
+        refresh_students_from(tx, first_id)
+
+
+def _refresh_job_eligibility(tx, columns, chunk, first_id):
+    refresh_jobs_from(tx, first_id)
+
+
+# What each importable table expects from an uploaded sheet.
+IMPORT_SPECS = {
+    "Students": {
+        "table": "STUDENT",
+        "required": ["First_Name", "Last_Name", "Phone", "CGPA"],
+        "optional": ["Student_ID", "Email", "Placement_Status", "Branch", "Backlogs", "Graduation_Year"],
+        "numeric": {"Student_ID": (1, None), "CGPA": (0.0, 10.0), "Backlogs": (0, None),
+                    "Graduation_Year": (1900, 2100)},
+        "integers": ["Student_ID", "Backlogs", "Graduation_Year"],
+        "dates": [],
+        "unique": ["Student_ID"],
+        # explicit and auto-increment ids can't be mixed: the new students' rows
+        # are refreshed either by the listed ids or from the first generated one
+        "all_or_none": ["Student_ID"],
+        "branches": ["Branch"],
+        "refresh": _refresh_student_eligibility,
+    },
+    "Companies": {
+        "table": "COMPANY",
+        "required": ["Company_Name"],
+        "optional": ["Company_Type", "Phone", "Industry_Type", "Email", "Website", "Address"],
+        "numeric": {},
+        "integers": [],
+        "dates": [],
+        "unique": ["Company_Name"],
+        "all_or_none": [],
+        "branches": [],
+        "refresh": None,
+    },
+    "Job Postings": {
+        "table": "JOB_POSTING",
+        "required": ["Company_ID", "Job_Title", "Salary_Package", "Minimum_CGPA", "Application_Deadline"],
+        "optional": ["Job_Description", "Location", "Number_of_Positions",
+                     "Eligible_Branches", "Max_Backlogs", "Graduation_Year", "Allow_Placed"],
+        "numeric": {
+            "Company_ID": (1, None),
+            "Salary_Package": (0.0, None),
+            "Minimum_CGPA": (0.0, 10.0),
+            "Number_of_Positions": (1, None),
+            "Max_Backlogs": (0, None),
+            "Graduation_Year": (1900, 2100),
+            "Allow_Placed": (0, 1),
+        },
+        "integers": ["Company_ID", "Number_of_Positions", "Max_Backlogs", "Graduation_Year", "Allow_Placed"],
+        "dates": ["Application_Deadline"],
+        "unique": [],
+        "all_or_none": [],
+        "branches": ["Eligible_Branches"],
+        "refresh": _refresh_job_eligibility,
+    },
+}
+
+
+def read_upload(uploaded_file):
+    """
+    Read a Streamlit UploadedFile (or path) into a DataFrame of strings.
+    .xlsx/.xls need openpyxl/xlrd installed; everything else is read as CSV.
+    """
+    name = getattr(uploaded_file, "name", str(uploaded_file)).lower()
+    if name.endswith((".xlsx", ".xls")):
+        df = pd.read_excel(uploaded_file, dtype=str)
+    else:
+        df = pd.read_csv(uploaded_file, dtype=str, skipinitialspace=True)
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def validate(df, spec):
+    """
+    Check an uploaded frame against an import spec.
+    Returns (valid_rows, errors) where errors has one row per rejected line
+    with the sheet line number and the reasons. Raises ValueError if
+    required columns are missing altogether.
+    """
+    missing = [c for c in spec["required"] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    columns = spec["required"] + [c for c in spec["optional"] if c in df.columns]
+    data = df[columns].copy()
+    for col in columns:
+        stripped = data[col].str.strip()
+        data[col] = stripped.where(stripped != "")
+    for col in spec["branches"]:
+        if col in data.columns:
+            data[col] = data[col].map(normalize_branches, na_action="ignore")
+
+    checks = []  # (mask of bad rows, message)
+    for col in spec["required"]:
+        checks.append((data[col].isna(), f"{col} is empty"))
+
+    for col in spec["all_or_none"]:
+        if col in data.columns:
+            checks.append((data[col].isna(), f"{col} is empty (fill it on every line or drop the column)"))
+
+    for col, (low, high) in spec["numeric"].items():
+        if col not in data.columns:
+            continue
+        values = pd.to_numeric(data[col], errors="coerce")
+        checks.append((data[col].notna() & values.isna(), f"{col} is not a number"))
+        if low is not None:
+            checks.append((values < low, f"{col} below {low}"))
+        if high is not None:
+            checks.append((values > high, f"{col} above {high}"))
+        if col in spec["integers"]:
+            checks.append((values.notna() & (values % 1 != 0), f"{col} is not a whole number"))
+            values = values.where(values % 1 == 0).astype("Int64")
+        data[col] = values
+
+    for col in spec["dates"]:
+        values = pd.to_datetime(data[col], errors="coerce")
+        checks.append((data[col].notna() & values.isna(), f"{col} is not a date"))
+        data[col] = values.dt.date
+
+    for col in spec["unique"]:
+        if col in data.columns:
+            checks.append((data[col].notna() & data[col].duplicated(keep=False), f"duplicate {col} in file"))
+
+    if spec["table"] == "JOB_POSTING":
+        known = {r["Company_ID"] for r in run_query("SELECT Company_ID FROM COMPANY")}
+        checks.append((data["Company_ID"].notna() & ~data["Company_ID"].isin(known), "unknown Company_ID"))
+
+    problems = pd.Series("", index=data.index)
+    for mask, message in checks:
+        problems = problems.mask(mask.fillna(False).astype(bool), problems + message + "; ")
+
+    bad = problems != ""
+    errors = df.loc[bad].copy()
+    errors.insert(0, "Errors", problems[bad].str.rstrip("; "))
+    # +2: header line plus 1-based numbering, so it matches the spreadsheet
+    errors.insert(0, "Line", errors.index + 2)
+    return data.loc[~bad], errors
+
+
+def insert_rows(spec, rows, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Insert validated rows with executemany (sent as multi-row INSERTs),
+    one transaction per batch that also refreshes the ELIGIBILITY rows
+    of the new students/jobs and the new students' PLACEMENT_SUMMARY. Returns counts and throughput.
+    `progress`, if given, is called with the fraction done after each batch.
+    """
+    columns = list(rows.columns)
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        spec["table"], ", ".join(columns), ", ".join(["%s"] * len(columns))
+    )
+    # plain Python values with None for missing cells; the driver can't bind NaN/numpy types
+    values = rows.astype(object).where(rows.notna(), None)
+    records = [tuple(r) for r in values.itertuples(index=False, name=None)]
+
+    start = time.perf_counter()
+    inserted = 0
+    batches = 0
+    for offset in range(0, len(records), batch_size):
+        chunk = records[offset:offset + batch_size]
+        with transaction() as tx:
+            tx.executemany(sql, chunk)
+            if spec["refresh"]:
+                spec["refresh"](tx, columns, chunk, tx.lastrowid)
+        inserted += len(chunk)
+        batches += 1
+        if progress:
+            progress(inserted / len(records))
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": inserted,
+        "batches": batches,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(inserted / elapsed, 1) if elapsed else float(inserted),
+    }
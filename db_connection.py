@@ -1,6 +1,20 @@
 # db_connection.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import mysql.connector
+from mysql.connector import errors
 import streamlit as st
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx, add_script_run_ctx
+except ImportError:  # older Streamlit: workers simply run without a script context
+    get_script_run_ctx = add_script_run_ctx = None
+
+from query_cache import QueryCache, tables_read, tables_written
+from profiling import get_profiler, current_site, capture_site, restore_site
 
 # Update these credentials if needed
 DB_CONFIG = {
@@ -12,47 +26,531 @@ DB_CONFIG = {
     "autocommit": False,
 }
 
+# Connection pool settings
+#   size      - max connections held open by this Streamlit process
+#   timeout   - seconds a checkout waits for a free connection before failing
+#   recycle   - seconds after which a connection is closed and reopened
+#   ping_idle - connections idle longer than this are pinged on checkout
+POOL_CONFIG = {
+    "size": 10,
+    "timeout": 10,
+    "recycle": 1800,
+    "ping_idle": 5,
+}
+
+# Shared SELECT result cache
+#   max_entries - LRU bound across all sessions
+#   default_ttl - seconds a result lives when run_query() gets no ttl
+CACHE_CONFIG = {
+    "max_entries": 512,
+    "default_ttl": 30,
+}
+
+# Concurrent reads via gather()
+#   max_workers - threads shared by every session for fanning out independent
+#                 reads; 0 makes gather() run its calls one after another
+FANOUT_CONFIG = {
+    "max_workers": 8,
+}
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of long-lived MySQL connections.
+    Connections are opened lazily up to `size`; when all are checked out,
+    callers wait up to `timeout` seconds for one to be released.
+    """
+
+    def __init__(self, config, size=10, timeout=10, recycle=1800, ping_idle=5):
+        self.config = dict(config)
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_idle = ping_idle
+        self._idle = deque()      # connections ready for checkout (LIFO)
+        self._meta = {}           # id(conn) -> [created_at, last_used]
+        self._open = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_ms": 0.0,
+            "created": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "timeouts": 0,
+        }
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.config)
+        now = time.monotonic()
+        with self._cond:
+            self._meta[id(conn)] = [now, now]
+            self._stats["created"] += 1
+        return conn
+
+    def _forget(self, conn):
+        # caller must hold self._cond
+        self._meta.pop(id(conn), None)
+        self._open -= 1
+        self._cond.notify()
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_stale(self, conn):
+        created, last_used = self._meta.get(id(conn), (0, 0))
+        now = time.monotonic()
+        if now - created > self.recycle:
+            return True
+        if now - last_used > self.ping_idle:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                return True
+        return False
+
+    def acquire(self):
+        """Check out a healthy connection, opening or recycling one if needed."""
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        waited = False
+        conn = None
+        with self._cond:
+            self._stats["checkouts"] += 1
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise errors.PoolError(
+                        f"No free database connection after {self.timeout}s "
+                        f"(pool size {self.size})."
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time_ms"] += (time.perf_counter() - start) * 1000
+
+        if conn is not None and self._is_stale(conn):
+            self._close_quietly(conn)
+            with self._cond:
+                self._meta.pop(id(conn), None)
+                self._stats["recycled"] += 1
+            conn = None
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def release(self, conn, discard=False):
+        """
+        Return a connection to the pool. Any open transaction is rolled back
+        so the next user never inherits a stale snapshot or pending writes.
+        """
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            if discard:
+                self._close_quietly(conn)
+                self._stats["discarded"] += 1
+                self._forget(conn)
+                return
+            meta = self._meta.get(id(conn))
+            if meta is not None:
+                meta[1] = time.monotonic()
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["wait_time_ms"] = round(stats["wait_time_ms"], 2)
+            stats["size"] = self.size
+            stats["open"] = self._open
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._open - len(self._idle)
+        return stats
+
+
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    """
+    Process-wide connection pool. Cached as a Streamlit resource so it is
+    shared by every session and survives script reruns and hot-reloads.
+    """
+    return ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+
+
+def pool_stats():
+    """Current pool metrics (checkouts, waits, wait time, recycled, ...)."""
+    return get_pool().stats()
+
+
+@st.cache_resource(show_spinner=False)
+def get_query_cache():
+    """Process-wide SELECT result cache shared by every session."""
+    return QueryCache(**CACHE_CONFIG)
+
+
+def cache_stats():
+    """Query cache hit/miss/eviction counters."""
+    return get_query_cache().stats()
+
+
+def invalidate_tables(tables):
+    """Evict cached results that read any of `tables` (None = everything)."""
+    get_query_cache().invalidate(tables)
+
+
 def get_connection():
     """
-    Create and return a new MySQL connection object.
-    We open a fresh connection for each operation to avoid stale connections
-    when Streamlit hot-reloads.
+    Check out a MySQL connection from the shared pool.
+    Callers must hand it back with release_connection() when done.
     """
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
-        return conn
+        return get_pool().acquire()
     except mysql.connector.Error as e:
         # show friendly error in Streamlit UI and stop execution
         st.error(f"Database connection failed: {e}")
         return None
 
-def run_query(query, params=None):
+
+def release_connection(conn, discard=False):
+    """Return a connection obtained from get_connection() to the pool."""
+    get_pool().release(conn, discard=discard)
+
+
+_local = threading.local()
+
+
+@contextmanager
+def query_tracker():
+    """
+    Count the statements issued by the current thread (one Streamlit
+    session) inside the block, e.g. to report what a page render cost.
+    """
+    stats = {"queries": 0, "cache_hits": 0, "writes": 0, "db_ms": 0.0, "total_ms": 0.0}
+    previous = getattr(_local, "tracker", None)
+    _local.tracker = stats
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        stats["db_ms"] = round(stats["db_ms"], 1)
+        _local.tracker = previous
+
+
+def _track(kind, started=None):
+    tracker = getattr(_local, "tracker", None)
+    if tracker is None:
+        return
+    tracker[kind] += 1
+    if started is not None:
+        tracker["db_ms"] += (time.perf_counter() - started) * 1000
+
+
+def _explain(conn, query, params):
+    """EXPLAIN plan for a slow statement, run on the connection that executed it."""
+    if query.lstrip()[:6].upper() not in ("SELECT", "UPDATE", "DELETE"):
+        return None
+    if params is None and "%s" in query:
+        return None  # executemany: no single parameter set to plan with
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("EXPLAIN " + query, params or ())
+        return cursor.fetchall()
+    except mysql.connector.Error as e:
+        return [{"error": str(e)}]
+    finally:
+        cursor.close()
+
+
+def _profile(conn, query, params, exec_started, rows, acquire_ms, kind):
+    """Record one statement with the profiler; slow ones get their EXPLAIN plan captured."""
+    profiler = get_profiler()
+    if not profiler.enabled:
+        return
+    elapsed_ms = (time.perf_counter() - exec_started) * 1000
+    site = current_site()
+    profiler.record(query, elapsed_ms, rows, acquire_ms, site, kind)
+    if profiler.is_slow(elapsed_ms):
+        plan = _explain(conn, query, params) if profiler.wants_explain(query) else None
+        profiler.record_slow(query, elapsed_ms, rows, site, plan)
+
+
+def _is_broken(exc):
+    return isinstance(exc, (errors.OperationalError, errors.InterfaceError))
+
+
+def run_query(query, params=None, ttl=None):
     """
     Executes SELECT queries and returns list of dicts.
+    Results are served from the shared cache for `ttl` seconds
+    (CACHE_CONFIG default when None); pass ttl=0 to always hit the database.
     """
+    cache = get_query_cache()
+    ttl = cache.default_ttl if ttl is None else ttl
+    if ttl > 0:
+        key = cache.make_key(query, params)
+        cached = cache.get(key)
+        if cached is not None:
+            _track("cache_hits")
+            return [dict(row) for row in cached]
+        tables = tables_read(query)
+        seen = cache.generations(tables)
+
+    started = time.perf_counter()
     conn = get_connection()
     if not conn:
         st.stop()
+    acquired = time.perf_counter()
+    broken = False
     cursor = conn.cursor(dictionary=True)
     try:
         cursor.execute(query, params or ())
         results = cursor.fetchall()
+        _profile(conn, query, params, acquired, len(results), (acquired - started) * 1000, "read")
+    except Exception as e:
+        broken = _is_broken(e)
+        raise
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn, discard=broken)
+        _track("queries", started)
+
+    if ttl > 0:
+        cache.put(key, tables, [dict(row) for row in results], ttl, seen)
     return results
 
+
+def stream_query(query, params=None, chunk_size=5000):
+    """
+    Stream a SELECT without materializing it: the result is read unbuffered
+    from the server and yielded as (cursor.description, rows) chunks of at
+    most `chunk_size` tuples; an empty result yields one chunk with no rows,
+    so consumers still get the column names. Never cached. If the consumer
+    stops early the half-read connection is discarded instead of going back
+    to the pool.
+    """
+    started = time.perf_counter()
+    conn = get_connection()
+    if not conn:
+        st.stop()
+    acquired = time.perf_counter()
+    finished = False
+    total = 0
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(query, params or ())
+        description = cursor.description
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                if total == 0:
+                    yield description, []
+                break
+            total += len(rows)
+            yield description, rows
+        finished = True
+        # elapsed time includes the consumer's writes, so keep streams out of the slow-query log
+        get_profiler().record(query, (time.perf_counter() - acquired) * 1000, total,
+                              (acquired - started) * 1000, current_site(), "stream")
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            finished = False
+        release_connection(conn, discard=not finished)
+        _track("queries", started)
+
+
 def run_commit(query, params=None):
     """
     Executes INSERT/UPDATE/DELETE and commits.
     """
+    started = time.perf_counter()
     conn = get_connection()
     if not conn:
         st.stop()
+    acquired = time.perf_counter()
+    broken = False
     cursor = conn.cursor()
     try:
         cursor.execute(query, params or ())
         conn.commit()
+        _profile(conn, query, params, acquired, cursor.rowcount, (acquired - started) * 1000, "write")
+    except Exception as e:
+        broken = _is_broken(e)
+        raise
     finally:
         cursor.close()
-        conn.close()
+        release_connection(conn, discard=broken)
+        _track("writes", started)
+    invalidate_tables(tables_written(query))
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor():
+    """Process-wide thread pool behind gather()."""
+    return ThreadPoolExecutor(max_workers=max(1, FANOUT_CONFIG["max_workers"]),
+                              thread_name_prefix="db-gather")
+
+
+def _run_gathered(call, site, ctx):
+    """Worker side of gather(): caller's call site/script context, own tracker."""
+    if add_script_run_ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+    with restore_site(site), query_tracker() as stats:
+        try:
+            return call(), None, stats
+        except Exception as e:
+            return None, e, stats
+
+
+def gather(*calls):
+    """
+    Run independent reads concurrently and return their results in order,
+    so a render waits for the slowest query instead of the sum of all.
+    Each call is a zero-argument callable, e.g.
+
+        jobs, apps = gather(
+            functools.partial(run_query, JOBS_SQL, ttl=300),
+            functools.partial(run_query, APPS_SQL, (student_id,)),
+        )
+
+    The first call runs on the calling thread, the rest on the shared pool,
+    each with its own pooled connection (so never inside transaction()).
+    Their statements count towards the caller's query_tracker(); the first
+    exception is re-raised once every call has finished.
+    """
+    if len(calls) < 2 or FANOUT_CONFIG["max_workers"] <= 0:
+        return [call() for call in calls]
+    site = capture_site()
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    executor = get_executor()
+    futures = [executor.submit(_run_gathered, call, site, ctx) for call in calls[1:]]
+    results, error = [], None
+    try:
+        results.append(calls[0]())
+    except Exception as e:
+        results.append(None)
+        error = e
+    tracker = getattr(_local, "tracker", None)
+    for future in futures:
+        result, exc, stats = future.result()
+        results.append(result)
+        error = error or exc
+        if tracker is not None:
+            for key in ("queries", "cache_hits", "writes", "db_ms"):
+                tracker[key] += stats[key]
+    if error is not None:
+        raise error
+    return results
+
+
+class Transaction:
+    """
+    Unit of work bound to a single pooled connection.
+    Obtained from transaction(); statements are committed together.
+    """
+
+    def __init__(self, conn, acquire_ms=0.0):
+        self.conn = conn
+        self.cursor = conn.cursor(dictionary=True)
+        self.lastrowid = None
+        self.written = set()   # tables to evict from the query cache on commit
+        self._acquire_ms = acquire_ms  # charged to the first statement
+
+    def execute(self, query, params=None):
+        """Run one INSERT/UPDATE/DELETE and return the affected row count."""
+        self._note_writes(query)
+        started = time.perf_counter()
+        self.cursor.execute(query, params or ())
+        self.lastrowid = self.cursor.lastrowid
+        self._profile(query, params, started, self.cursor.rowcount, "write")
+        return self.cursor.rowcount
+
+    def executemany(self, query, seq_params):
+        """Run one statement for every parameter tuple (batched by the driver)."""
+        self._note_writes(query)
+        started = time.perf_counter()
+        self.cursor.executemany(query, seq_params)
+        self.lastrowid = self.cursor.lastrowid
+        self._profile(query, None, started, self.cursor.rowcount, "write")
+        return self.cursor.rowcount
+
+    def query(self, query, params=None):
+        """Run a SELECT inside the transaction (never cached) and return list of dicts."""
+        started = time.perf_counter()
+        self.cursor.execute(query, params or ())
+        rows = self.cursor.fetchall()
+        self._profile(query, params, started, len(rows), "read")
+        return rows
+
+    def _note_writes(self, query):
+        tables = tables_written(query)
+        if tables is None:
+            self.written = None
+        elif self.written is not None:
+            self.written |= tables
+
+    def _profile(self, query, params, started, rows, kind):
+        acquire_ms, self._acquire_ms = self._acquire_ms, 0.0
+        _profile(self.conn, query, params, started, rows, acquire_ms, kind)
+
+
+@contextmanager
+def transaction():
+    """
+    Run several statements on one connection with a single COMMIT.
+    Any exception inside the block rolls everything back.
+
+        with transaction() as tx:
+            tx.execute("INSERT ...", (...))
+            tx.execute("UPDATE ...", (...))
+    """
+    started = time.perf_counter()
+    conn = get_connection()
+    if not conn:
+        st.stop()
+    broken = False
+    tx = Transaction(conn, (time.perf_counter() - started) * 1000)
+    try:
+        yield tx
+        conn.commit()
+    except Exception as e:
+        broken = _is_broken(e)
+        if not broken:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+        raise
+    finally:
+        try:
+            tx.cursor.close()
+        except Exception:
+            broken = True
+        release_connection(conn, discard=broken)
+        _track("writes", started)
+    invalidate_tables(tx.written)
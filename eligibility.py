@@ -0,0 +1,70 @@
+# eligibility.py - materialized student x job eligibility (ELIGIBILITY table)
+from db_connection import run_query
+
+# Student/job pairs that satisfy every job criterion. Empty/NULL job criteria
+# mean "no restriction"; Eligible_Branches is a comma-separated list.
+ELIGIBLE_PAIRS_SQL = """
+    SELECT s.Student_ID, j.Job_ID
+    FROM STUDENT s
+    JOIN JOB_POSTING j
+      ON COALESCE(s.CGPA, 0) >= COALESCE(j.Minimum_CGPA, 0)
+     AND (j.Eligible_Branches IS NULL OR j.Eligible_Branches = ''
+          OR FIND_IN_SET(s.Branch, j.Eligible_Branches) > 0)
+     AND (j.Max_Backlogs IS NULL OR COALESCE(s.Backlogs, 0) <= j.Max_Backlogs)
+     AND (j.Graduation_Year IS NULL OR s.Graduation_Year = j.Graduation_Year)
+     AND (j.Allow_Placed = 1 OR COALESCE(s.Placement_Status, '') <> 'Placed')
+"""
+
+
+def normalize_branches(value):
+    """'CSE, ece ,' -> 'CSE,ECE' (FIND_IN_SET needs no spaces); blank -> None."""
+    branches = [b.strip().upper() for b in str(value or "").split(",") if b.strip()]
+    return ",".join(branches) or None
+
+
+def _refresh(tx, where, params=()):
+    tx.execute(f"DELETE e FROM ELIGIBILITY e JOIN STUDENT s ON e.Student_ID = s.Student_ID "
+               f"JOIN JOB_POSTING j ON e.Job_ID = j.Job_ID WHERE {where}", params)
+    tx.execute(f"INSERT INTO ELIGIBILITY (Student_ID, Job_ID) {ELIGIBLE_PAIRS_SQL} WHERE {where}", params)
+
+
+def refresh_students(tx, student_ids):
+    """Recompute eligibility rows for these students inside transaction `tx`."""
+    ids = list(student_ids)
+    if ids:
+        _refresh(tx, f"s.Student_ID IN ({', '.join(['%s'] * len(ids))})", tuple(ids))
+
+
+def refresh_students_from(tx, first_id):
+    """Recompute for every student with Student_ID >= first_id (after a bulk insert)."""
+    _refresh(tx, "s.Student_ID >= %s", (first_id,))
+
+
+def refresh_jobs(tx, job_ids):
+    """Recompute eligibility rows for these jobs inside transaction `tx`."""
+    ids = list(job_ids)
+    if ids:
+        _refresh(tx, f"j.Job_ID IN ({', '.join(['%s'] * len(ids))})", tuple(ids))
+
+
+def refresh_jobs_from(tx, first_id):
+    """Recompute for every job with Job_ID >= first_id (after a bulk insert)."""
+    _refresh(tx, "j.Job_ID >= %s", (first_id,))
+
+
+def rebuild(tx):
+    """Recompute the whole matrix."""
+    tx.execute("DELETE FROM ELIGIBILITY")
+    tx.execute(f"INSERT INTO ELIGIBILITY (Student_ID, Job_ID) {ELIGIBLE_PAIRS_SQL}")
+
+
+def eligible_job_ids(student_id):
+    """Job IDs the student is eligible for (primary-key range scan)."""
+    rows = run_query("SELECT Job_ID FROM ELIGIBILITY WHERE Student_ID=%s", (student_id,))
+    return {r["Job_ID"] for r in rows}
+
+
+def is_eligible(student_id, job_id):
+    rows = run_query("SELECT 1 AS ok FROM ELIGIBILITY WHERE Student_ID=%s AND Job_ID=%s",
+                     (student_id, job_id))
+    return bool(rows)
@@ -0,0 +1,209 @@
+# exports.py - chunked CSV/Parquet exports of applications, interviews and placements
+import argparse
+import csv
+import datetime
+import decimal
+import os
+import sys
+import tempfile
+import time
+
+from mysql.connector import FieldType
+
+from db_connection import stream_query
+from pagination import Filters
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Each report streams in primary-key order so MySQL can start sending rows
+# straight off the index instead of sorting the whole result first.
+REPORTS = {
+    "Applications": {
+        "columns": """a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name, s.Email, s.Phone,
+                      s.Branch, s.CGPA, j.Job_ID, j.Job_Title, c.Company_Name,
+                      a.Application_Date, a.Application_Status""",
+        "from": """FROM APPLICATION a
+                   JOIN STUDENT s ON a.Student_ID = s.Student_ID
+                   JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+                   JOIN COMPANY c ON j.Company_ID = c.Company_ID""",
+        "date": "a.Application_Date",
+        "order": "a.Application_ID",
+    },
+    "Interviews": {
+        "columns": """i.Interview_ID, a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name,
+                      j.Job_ID, j.Job_Title, c.Company_Name, i.Interview_Date, i.Interview_Round, i.Result""",
+        "from": """FROM INTERVIEW i
+                   JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+                   JOIN STUDENT s ON a.Student_ID = s.Student_ID
+                   JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+                   JOIN COMPANY c ON j.Company_ID = c.Company_ID""",
+        "date": "i.Interview_Date",
+        "order": "i.Interview_ID",
+    },
+    "Placements": {
+        "columns": """s.Student_ID, s.First_Name, s.Last_Name, s.Branch, s.CGPA, s.Placement_Status,
+                      c.Company_Name, j.Job_ID, j.Job_Title, j.Salary_Package, a.Application_Date""",
+        "from": """FROM APPLICATION a
+                   JOIN STUDENT s ON a.Student_ID = s.Student_ID
+                   JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+                   JOIN COMPANY c ON j.Company_ID = c.Company_ID""",
+        "where": "a.Application_Status IN ('Selected', 'Placed')",
+        "date": "a.Application_Date",
+        "order": "a.Application_ID",
+    },
+}
+
+FORMATS = {"CSV": ("csv", "text/csv"), "Parquet": ("parquet", "application/octet-stream")}
+
+# Files prepared for download in the portal hold personal data: they live in one
+# private directory and anything older than SPOOL_MAX_AGE_SECONDS is purged, so
+# files of sessions that ended without a new export don't pile up.
+SPOOL_DIR = os.path.join(tempfile.gettempdir(), "placement_exports")
+SPOOL_MAX_AGE_SECONDS = 30 * 60
+
+
+def purge_spool(max_age=SPOOL_MAX_AGE_SECONDS):
+    """Delete spooled exports older than `max_age` seconds; returns how many were removed."""
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(SPOOL_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:  # purged by another session meanwhile
+            pass
+    return removed
+
+
+def spool_file(fmt):
+    """A new named file in SPOOL_DIR opened for writing one export in `fmt`."""
+    os.makedirs(SPOOL_DIR, mode=0o700, exist_ok=True)
+    extension, _ = FORMATS[fmt]
+    if fmt == "Parquet":
+        return tempfile.NamedTemporaryFile(dir=SPOOL_DIR, prefix="placement_", suffix=f".{extension}",
+                                           delete=False, mode="wb")
+    return tempfile.NamedTemporaryFile(dir=SPOOL_DIR, prefix="placement_", suffix=f".{extension}",
+                                       delete=False, mode="w", newline="", encoding="utf-8")
+
+
+def report_query(report, company_id=None, job_id=None, date_from=None, date_to=None):
+    """SQL + params for one report, scoped to a company, a job and/or a season."""
+    spec = REPORTS[report]
+    filters = Filters()
+    if spec.get("where"):
+        filters.add(spec["where"])
+    if company_id:
+        filters.add("j.Company_ID = %s", company_id)
+    if job_id:
+        filters.add("j.Job_ID = %s", job_id)
+    if date_from:
+        filters.add(f"{spec['date']} >= %s", date_from)
+    if date_to:
+        filters.add(f"{spec['date']} <= %s", date_to)
+    sql = f"SELECT {spec['columns']} {spec['from']}{filters.where()} ORDER BY {spec['order']}"
+    return sql, tuple(filters.params)
+
+
+def write_csv(chunks, fileobj):
+    """Write streamed (description, rows) chunks as CSV; returns the row count."""
+    writer = csv.writer(fileobj)
+    total = 0
+    header = False
+    for description, rows in chunks:
+        # written even when the first (only) chunk is empty, so a filter with no matches still has columns
+        if not header:
+            writer.writerow([d[0] for d in description])
+            header = True
+        writer.writerows(rows)
+        total += len(rows)
+    return total
+
+
+def _arrow_type(pa, type_code):
+    name = FieldType.get_info(type_code)
+    if name in ("TINY", "SHORT", "LONG", "LONGLONG", "INT24", "YEAR"):
+        return pa.int64()
+    if name in ("FLOAT", "DOUBLE", "DECIMAL", "NEWDECIMAL"):
+        return pa.float64()
+    if name in ("DATE", "NEWDATE"):
+        return pa.date32()
+    if name in ("DATETIME", "TIMESTAMP"):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _arrow_value(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", "replace")
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    return value
+
+
+def write_parquet(query, params, fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream a query into a Parquet file, one row group per chunk.
+    Needs the optional pyarrow package. Returns the row count.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    total = 0
+    try:
+        for description, rows in stream_query(query, params, chunk_size):
+            if writer is None:
+                schema = pa.schema([(d[0], _arrow_type(pa, d[1])) for d in description])
+                writer = pq.ParquetWriter(fileobj, schema)
+            data = {d[0]: [_arrow_value(r[i]) for r in rows] for i, d in enumerate(description)}
+            writer.write_table(pa.Table.from_pydict(data, schema=writer.schema))
+            total += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+
+def export(report, fmt, fileobj, chunk_size=DEFAULT_CHUNK_SIZE, **scope):
+    """Stream `report` into an open file in `fmt` ("CSV" or "Parquet")."""
+    sql, params = report_query(report, **scope)
+    if fmt == "Parquet":
+        return write_parquet(sql, params, fileobj, chunk_size)
+    return write_csv(stream_query(sql, params, chunk_size), fileobj)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a placement report to CSV or Parquet.")
+    parser.add_argument("report", choices=list(REPORTS))
+    parser.add_argument("--format", choices=list(FORMATS), default="CSV")
+    parser.add_argument("--company", type=int, help="Company_ID to restrict to")
+    parser.add_argument("--job", type=int, help="Job_ID to restrict to")
+    parser.add_argument("--from", dest="date_from", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", type=datetime.date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--out", help="output file (CSV defaults to stdout)")
+    args = parser.parse_args(argv)
+
+    scope = dict(company_id=args.company, job_id=args.job, date_from=args.date_from, date_to=args.date_to)
+    if args.format == "Parquet":
+        if not args.out:
+            parser.error("--out is required for Parquet")
+        with open(args.out, "wb") as f:
+            total = export(args.report, "Parquet", f, args.chunk_size, **scope)
+    elif args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            total = export(args.report, "CSV", f, args.chunk_size, **scope)
+    else:
+        total = export(args.report, "CSV", sys.stdout, args.chunk_size, **scope)
+    print(f"{total} rows exported", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
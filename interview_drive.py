@@ -0,0 +1,174 @@
+# interview_drive.py - batch interview scheduling and result entry for recruitment drives
+import datetime
+
+import pandas as pd
+
+from db_connection import run_query, transaction
+import placement_summary
+import status_events
+
+SCHEDULED_STATUS = "Interview Scheduled"
+CHUNK = 500  # ids per IN (...) list
+
+
+def _in(values):
+    return ", ".join(["%s"] * len(values))
+
+
+def drive_candidates(job_id, statuses):
+    """Applications to `job_id` in any of `statuses`, one row per application."""
+    if not statuses:
+        return []
+    return run_query(f"""
+        SELECT a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name, s.CGPA,
+               a.Application_Date, a.Application_Status
+        FROM APPLICATION a
+        JOIN STUDENT s ON a.Student_ID = s.Student_ID
+        WHERE a.Job_ID = %s AND a.Application_Status IN ({_in(statuses)})
+        ORDER BY a.Application_ID
+    """, (job_id,) + tuple(statuses), ttl=0)
+
+
+def slot_dates(count, first_day, per_day, skip_weekends=True):
+    """Spread `count` interviews over consecutive days, `per_day` at most on each."""
+    dates, day = [], first_day
+    while len(dates) < count:
+        if not (skip_weekends and day.weekday() >= 5):
+            dates.extend([day] * min(per_day, count - len(dates)))
+        day += datetime.timedelta(days=1)
+    return dates
+
+
+def schedule_round(slots, round_name):
+    """
+    Create one `round_name` interview per (application_id, date) in `slots`
+    and mark those applications as scheduled, all in a single transaction.
+    Applications that already have this round are skipped.
+    Returns (scheduled, skipped).
+    """
+    slots = [(int(app_id), date) for app_id, date in slots]
+    if not slots:
+        return 0, 0
+    ids = [app_id for app_id, _ in slots]
+    with transaction() as tx:
+        placement_summary.lock_applications(tx, ids)
+        # Locking the applications queues concurrent schedulers of the same round, and the
+        # check is a locking (current) read, so it sees rounds the other one has just committed.
+        tx.query(f"SELECT Application_ID FROM APPLICATION WHERE Application_ID IN ({_in(ids)}) FOR UPDATE",
+                 tuple(ids))
+        existing = {r["Application_ID"] for r in tx.query(
+            f"SELECT Application_ID FROM INTERVIEW WHERE Interview_Round=%s AND Application_ID IN ({_in(ids)}) "
+            f"FOR UPDATE",
+            (round_name,) + tuple(ids),
+        )}
+        new = [(app_id, date) for app_id, date in slots if app_id not in existing]
+        if new:
+            # plain VALUES so the driver sends one multi-row INSERT
+            tx.executemany(
+                "INSERT INTO INTERVIEW (Application_ID, Interview_Date, Interview_Round, Result) "
+                "VALUES (%s, %s, %s, 'Pending')",
+                [(app_id, date, round_name) for app_id, date in new],
+            )
+            new_ids = [app_id for app_id, _ in new]
+            tx.execute(f"UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID IN ({_in(new_ids)})",
+                       (SCHEDULED_STATUS,) + tuple(new_ids))
+            placement_summary.refresh_applications(tx, new_ids)
+            status_events.interviews_scheduled(tx, [r["Interview_ID"] for r in tx.query(
+                f"SELECT Interview_ID FROM INTERVIEW WHERE Interview_Round=%s AND Application_ID IN ({_in(new_ids)})",
+                (round_name,) + tuple(new_ids),
+            )])
+    return len(new), len(slots) - len(new)
+
+
+def job_rounds(job_id):
+    rows = run_query("""
+        SELECT DISTINCT i.Interview_Round
+        FROM INTERVIEW i JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+        WHERE a.Job_ID = %s
+        ORDER BY i.Interview_Round
+    """, (job_id,), ttl=0)
+    return [r["Interview_Round"] for r in rows if r["Interview_Round"]]
+
+
+def round_interviews(job_id, round_name):
+    """Grid rows for entering results of one round of a drive."""
+    return run_query("""
+        SELECT i.Interview_ID, a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name,
+               i.Interview_Date, i.Result
+        FROM INTERVIEW i
+        JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+        JOIN STUDENT s ON a.Student_ID = s.Student_ID
+        WHERE a.Job_ID = %s AND i.Interview_Round = %s
+        ORDER BY i.Interview_Date, i.Interview_ID
+    """, (job_id, round_name), ttl=0)
+
+
+def changed_results(original, edited):
+    """[(interview_id, result)] for rows whose Result differs between two grid frames."""
+    before = dict(zip(original["Interview_ID"], original["Result"]))
+    return [(int(i), r) for i, r in zip(edited["Interview_ID"], edited["Result"])
+            if before.get(i) != r]
+
+
+def parse_results(df, allowed, interview_ids=None):
+    """
+    Validate an uploaded Interview_ID,Result sheet. Returns (results, errors)
+    where errors is a frame of rejected sheet lines and their reasons.
+    Raises ValueError if either column is missing.
+    """
+    missing = [c for c in ("Interview_ID", "Result") if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+    allowed_by_key = {a.lower(): a for a in allowed}
+    results, errors, seen = [], [], set()
+    for line, (raw_id, raw_result) in enumerate(zip(df["Interview_ID"], df["Result"]), start=2):
+        reasons = []
+        raw_id = "" if pd.isna(raw_id) else str(raw_id).strip()
+        result = allowed_by_key.get("" if pd.isna(raw_result) else str(raw_result).strip().lower())
+        interview_id = int(raw_id) if raw_id.isdigit() else None
+        if interview_id is None:
+            reasons.append("Interview_ID must be a whole number")
+        elif interview_ids is not None and interview_id not in interview_ids:
+            reasons.append("not an interview of this round")
+        elif interview_id in seen:
+            reasons.append("duplicate Interview_ID")
+        if result is None:
+            reasons.append(f"Result must be one of: {', '.join(allowed)}")
+        if reasons:
+            errors.append({"line": line, "Interview_ID": raw_id, "errors": "; ".join(reasons)})
+        else:
+            seen.add(interview_id)
+            results.append((interview_id, result))
+    return results, pd.DataFrame(errors, columns=["line", "Interview_ID", "errors"])
+
+
+def record_results(results):
+    """
+    Set INTERVIEW.Result for every (interview_id, result) and carry it to the
+    owning APPLICATION's status and the students' placement summaries, as
+    the single-interview form does, in one transaction. Returns the number
+    of interviews updated.
+    """
+    results = [(int(interview_id), result) for interview_id, result in results]
+    if not results:
+        return 0
+    with transaction() as tx:
+        placement_summary.lock_interviews(tx, [interview_id for interview_id, _ in results])
+        for start in range(0, len(results), CHUNK):
+            chunk = results[start:start + CHUNK]
+            ids = tuple(interview_id for interview_id, _ in chunk)
+            # one CASE statement per chunk: executemany() would send an UPDATE per row
+            tx.execute(
+                f"UPDATE INTERVIEW SET Result = CASE Interview_ID {' '.join(['WHEN %s THEN %s'] * len(chunk))} END "
+                f"WHERE Interview_ID IN ({_in(ids)})",
+                tuple(v for pair in chunk for v in pair) + ids,
+            )
+            tx.execute(f"""
+                UPDATE APPLICATION a
+                JOIN INTERVIEW i ON i.Application_ID = a.Application_ID
+                SET a.Application_Status = i.Result
+                WHERE i.Interview_ID IN ({_in(ids)})
+            """, ids)
+            placement_summary.refresh_interviews(tx, ids)
+            status_events.interview_results(tx, ids)
+    return len(results)
@@ -0,0 +1,327 @@
+# job_search.py - in-process inverted index over job postings: ranked, typo-tolerant search
+import bisect
+import datetime
+import heapq
+import math
+import re
+import threading
+import time
+
+import numpy as np
+import streamlit as st
+
+from db_connection import run_query
+
+# Search settings
+#   refresh_seconds - how stale the index may get before a search tops it up
+#   top_k           - results returned by default
+#   min_similarity  - trigram similarity (0-1) for a misspelt word to match a term
+#   max_expansions  - indexed terms a single query word may expand to
+#   settle_seconds  - how long a write may take to commit; rows stamped within
+#                     this window of the database clock are re-read next refresh
+SEARCH_CONFIG = {
+    "refresh_seconds": 10,
+    "settle_seconds": 5,
+    "top_k": 25,
+    "min_similarity": 0.4,
+    "max_expansions": 8,
+}
+
+# title matches outrank company/location matches, which outrank the description
+FIELD_WEIGHTS = {
+    "Job_Title": 3.0,
+    "Company_Name": 2.0,
+    "Location": 1.5,
+    "Industry_Type": 1.0,
+    "Job_Description": 1.0,
+}
+K1, B = 1.2, 0.75  # BM25 term-frequency saturation / length normalization
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")  # keeps c++ / c#
+
+_DOCS_SQL = """
+    SELECT j.Job_ID, j.Job_Title, j.Job_Description, j.Salary_Package, j.Location,
+           j.Minimum_CGPA, j.Application_Deadline, c.Company_Name, c.Industry_Type,
+           GREATEST(j.Updated_At, c.Updated_At) AS Updated_At
+    FROM JOB_POSTING j
+    JOIN COMPANY c ON j.Company_ID = c.Company_ID
+"""
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text or "").lower())
+
+
+def trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent swaps cost 1), or limit + 1 if above `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+class JobSearchIndex:
+    """
+    Inverted index of job postings (plus their company) kept in memory and
+    topped up with only the rows whose Updated_At moved past the last
+    watermark. Query words match indexed terms exactly, by prefix (the word
+    being typed) or approximately (trigram overlap / one or two typos); hits
+    are ranked by BM25 over field-weighted term frequencies.
+
+    Each posting owns a slot in numpy arrays (length, salary, location) so
+    scoring and facet filters are vectorized over postings lists.
+    """
+
+    def __init__(self):
+        self.docs = {}                    # Job_ID -> row (display + facet fields)
+        self._slot = {}                   # Job_ID -> slot
+        self._free = []                   # slots of removed postings
+        self._job_ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._length = np.zeros(0)        # weighted token count
+        self._salary = np.zeros(0)
+        self._location = np.zeros(0, dtype=np.int32)
+        self._location_codes = {}         # Location -> code
+        self._doc_terms = {}              # Job_ID -> {term: weighted tf}
+        self._postings = {}               # term -> {slot: weighted tf}
+        self._arrays = {}                 # term -> (slots, tfs) cache of _postings[term]
+        self._trigrams = {}               # trigram -> {term}
+        self._gram_count = {}             # term -> len(trigrams(term))
+        self._stamps = {}                 # Job_ID -> Updated_At last indexed
+        self._sorted_terms = None         # for prefix lookups; rebuilt lazily
+        self.watermark = None
+        self.refreshed_at = None
+        self.last_refresh = {}
+        self._lock = threading.Lock()
+
+    # ---- maintenance ---- #
+    def _grow(self):
+        old_size = len(self._alive)
+        size = max(1024, 2 * old_size)
+        for name in ("_job_ids", "_alive", "_length", "_salary", "_location"):
+            old = getattr(self, name)
+            new = np.zeros(size, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self._free.extend(range(size - 1, old_size - 1, -1))  # pop() hands out low slots first
+
+    def _remove(self, job_id):
+        slot = self._slot.pop(job_id, None)
+        if slot is None:
+            return
+        for term in self._doc_terms.pop(job_id):
+            posting = self._postings[term]
+            del posting[slot]
+            self._arrays.pop(term, None)
+            if not posting:
+                del self._postings[term]
+                del self._gram_count[term]
+                for gram in trigrams(term):
+                    self._trigrams[gram].discard(term)
+                self._sorted_terms = None
+        self._alive[slot] = False
+        self._free.append(slot)
+        self._stamps.pop(job_id, None)
+        del self.docs[job_id]
+
+    def _add(self, row):
+        job_id = row["Job_ID"]
+        self._remove(job_id)
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        terms = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(row.get(field)):
+                terms[term] = terms.get(term, 0.0) + weight
+        for term, tf in terms.items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                grams = trigrams(term)
+                self._gram_count[term] = len(grams)
+                for gram in grams:
+                    self._trigrams.setdefault(gram, set()).add(term)
+                self._sorted_terms = None
+            self._postings[term][slot] = tf
+            self._arrays.pop(term, None)
+        location = row.get("Location") or ""
+        self._slot[job_id] = slot
+        self._stamps[job_id] = row.get("Updated_At")
+        self._doc_terms[job_id] = terms
+        self._job_ids[slot] = job_id
+        self._alive[slot] = True
+        self._length[slot] = sum(terms.values())
+        self._salary[slot] = float(row.get("Salary_Package") or 0)
+        self._location[slot] = self._location_codes.setdefault(location, len(self._location_codes))
+        self.docs[job_id] = {k: row.get(k) for k in
+                             ("Job_ID", "Job_Title", "Company_Name", "Location", "Salary_Package",
+                              "Minimum_CGPA", "Application_Deadline")}
+
+    def refresh(self, force=False):
+        """Index postings changed since the watermark; returns how many were (re)indexed."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.refreshed_at and now - self.refreshed_at < SEARCH_CONFIG["refresh_seconds"]:
+                return 0
+            start = time.perf_counter()
+            # read before the rows so the new watermark never runs ahead of what was read
+            head = run_query("SELECT COUNT(*) AS n, NOW() AS now FROM JOB_POSTING", ttl=0)[0]
+            if self.watermark is None:
+                rows = run_query(_DOCS_SQL, ttl=0)
+            else:
+                # Two indexable range scans instead of one OR across both tables
+                rows = (run_query(_DOCS_SQL + " WHERE j.Updated_At > %s", (self.watermark,), ttl=0)
+                        + run_query(_DOCS_SQL + " WHERE c.Updated_At > %s", (self.watermark,), ttl=0))
+            rows = [r for r in rows if r["Job_ID"] not in self._slot or self._stamps[r["Job_ID"]] != r.get("Updated_At")]
+            for row in rows:
+                self._add(row)
+            # Rows stamped in the last few seconds may belong to transactions that had not
+            # committed yet, so the watermark trails the database clock rather than the
+            # newest stamp; the unchanged ones among them are skipped above.
+            settled = head["now"] - datetime.timedelta(seconds=SEARCH_CONFIG["settle_seconds"])
+            self.watermark = max(settled, self.watermark) if self.watermark else settled
+
+            # deletions leave no Updated_At behind; a count mismatch triggers an ID sweep
+            removed = 0
+            if head["n"] != len(self.docs):
+                live = {r["Job_ID"] for r in run_query("SELECT Job_ID FROM JOB_POSTING", ttl=0)}
+                for job_id in [j for j in self.docs if j not in live]:
+                    self._remove(job_id)
+                    removed += 1
+
+            self.refreshed_at = now
+            self.last_refresh = {
+                "postings": len(self.docs),
+                "terms": len(self._postings),
+                "reindexed": len(rows),
+                "removed": removed,
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            return len(rows)
+
+    # ---- querying ---- #
+    def _expand(self, word, is_last):
+        """Indexed terms matching a query word, as {term: similarity}."""
+        matches = {}
+        if word in self._postings:
+            matches[word] = 1.0
+        if is_last and len(word) >= 2:
+            # the word may still be being typed: prefix matches
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._postings)
+            i = bisect.bisect_left(self._sorted_terms, word)
+            while i < len(self._sorted_terms) and self._sorted_terms[i].startswith(word):
+                term = self._sorted_terms[i]
+                matches.setdefault(term, 0.5 + 0.5 * len(word) / len(term))
+                i += 1
+        if len(word) >= 3:
+            grams = trigrams(word)
+            shared = {}
+            for gram in grams:
+                for term in self._trigrams.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            limit = 1 if len(word) <= 5 else 2
+            for term, n in shared.items():
+                # a single shared trigram is neither similar enough nor worth an edit distance
+                if n < 2 or term in matches:
+                    continue
+                similarity = n / (len(grams) + self._gram_count[term] - n)
+                if similarity < SEARCH_CONFIG["min_similarity"]:
+                    # trigrams undercount swaps/deletions ("pyhton", "devloper")
+                    distance = _edit_distance(word, term, limit)
+                    if distance <= limit:
+                        similarity = max(similarity, 1 - distance / max(len(word), len(term)))
+                if similarity >= SEARCH_CONFIG["min_similarity"]:
+                    matches[term] = similarity
+        best = heapq.nlargest(SEARCH_CONFIG["max_expansions"], matches.items(), key=lambda kv: kv[1])
+        return dict(best)
+
+    def _posting_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            posting = self._postings[term]
+            arrays = self._arrays[term] = (np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                                           np.fromiter(posting.values(), dtype=float, count=len(posting)))
+        return arrays
+
+    def _filter_mask(self, locations, salary_range, job_ids):
+        mask = self._alive.copy()
+        if job_ids is not None:
+            allowed = np.zeros_like(mask)
+            allowed[[self._slot[j] for j in job_ids if j in self._slot]] = True
+            mask &= allowed
+        if locations:
+            codes = [self._location_codes[loc] for loc in locations if loc in self._location_codes]
+            mask &= np.isin(self._location, codes)
+        if salary_range:
+            mask &= (self._salary >= salary_range[0]) & (self._salary <= salary_range[1])
+        return mask
+
+    def _top(self, values, mask, top_k):
+        """Slots of the top_k largest `values` where `mask`, best first."""
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-values[candidates], top_k - 1)[:top_k]]
+        return candidates[np.argsort(-values[candidates], kind="stable")]
+
+    def search(self, query="", locations=None, salary_range=None, job_ids=None, top_k=None):
+        """
+        Top-k postings for `query` as dicts with a Score, restricted to
+        `locations`, a (low, high) `salary_range` and/or the `job_ids` set
+        (e.g. the student's eligible jobs). An empty query lists the
+        filtered postings by salary.
+        """
+        top_k = top_k or SEARCH_CONFIG["top_k"]
+        with self._lock:
+            mask = self._filter_mask(locations, salary_range, job_ids)
+            words = tokenize(query)
+            if not words:
+                return [dict(self.docs[int(self._job_ids[s])], Score=None)
+                        for s in self._top(self._salary, mask, top_k)]
+
+            n = len(self.docs) or 1
+            avg_length = (self._length[self._alive].mean() if n else 1.0) or 1.0
+            length_norm = K1 * (1 - B + B * self._length / avg_length)
+            scores = np.zeros(len(self._alive))
+            words_hit = np.zeros(len(self._alive), dtype=np.int32)
+            for position, word in enumerate(words):
+                hit = np.zeros(len(self._alive), dtype=bool)
+                for term, similarity in self._expand(word, position == len(words) - 1).items():
+                    slots, tfs = self._posting_arrays(term)
+                    idf = math.log(1 + (n - len(slots) + 0.5) / (len(slots) + 0.5))
+                    scores[slots] += similarity * idf * tfs * (K1 + 1) / (tfs + length_norm[slots])
+                    hit[slots] = True
+                words_hit += hit
+            # postings matching every query word come first
+            scores *= words_hit / len(words)
+            best = self._top(scores, mask & (words_hit > 0), top_k)
+            return [dict(self.docs[int(self._job_ids[s])], Score=round(float(scores[s]), 2)) for s in best]
+
+    def facets(self):
+        """Locations and the salary bounds currently indexed, for the filter widgets."""
+        with self._lock:
+            locations = sorted(loc for loc, code in self._location_codes.items()
+                               if loc and (self._location[self._alive] == code).any())
+            salaries = self._salary[self._alive]
+        return locations, (float(salaries.min()), float(salaries.max())) if len(salaries) else (0.0, 0.0)
+
+
+@st.cache_resource(show_spinner=False)
+def get_search_index():
+    """Shared by every student session so postings are indexed once per process."""
+    return JobSearchIndex()
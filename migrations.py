@@ -0,0 +1,431 @@
+# migrations.py - versioned schema creation/upgrade, applied once per process at startup
+import argparse
+
+import streamlit as st
+
+from db_connection import get_connection, release_connection, invalidate_tables, run_query, transaction
+from eligibility import ELIGIBLE_PAIRS_SQL
+from placement_summary import SUMMARY_SQL, UPSERT_SQL
+from student_profile import BUMP_VERSION
+
+
+# ---------------- STEP HELPERS ---------------- #
+def sql(statement):
+    """Step that runs a plain statement."""
+    def step(cursor):
+        cursor.execute(statement)
+    return step
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return bool(cursor.fetchall())
+
+
+def _index_exists(cursor, table, columns, unique=False):
+    """
+    True if some index already starts with exactly these columns (leftmost
+    prefix). A unique constraint is only satisfied by a unique index on
+    exactly these columns.
+    """
+    cursor.execute("""
+        SELECT INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS cols,
+               MAX(NON_UNIQUE) AS non_unique
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        GROUP BY INDEX_NAME
+    """, (table,))
+    wanted = ",".join(columns).lower()
+    for _, cols, non_unique in cursor.fetchall():
+        cols = (cols or "").lower()
+        if unique:
+            if cols == wanted and not int(non_unique):
+                return True
+        elif cols == wanted or cols.startswith(wanted + ","):
+            return True
+    return False
+
+
+def add_column(table, column, definition):
+    """Step that adds a column unless it is already there (MySQL lacks ADD COLUMN IF NOT EXISTS)."""
+    def step(cursor):
+        if not _column_exists(cursor, table, column):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def add_index(table, name, columns, kind="INDEX"):
+    """Step that creates an index unless an equivalent one already exists."""
+    def step(cursor):
+        if not _index_exists(cursor, table, columns, unique=kind.upper() == "UNIQUE"):
+            cursor.execute(f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)})")
+    return step
+
+
+def drop_index(table, name):
+    """Step that drops an index if it exists (MySQL lacks DROP INDEX IF EXISTS)."""
+    def step(cursor):
+        cursor.execute("""
+            SELECT 1 FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """, (table, name))
+        if cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} DROP INDEX {name}")
+    return step
+
+
+# ---------------- DUPLICATE APPLICATIONS ---------------- #
+class MigrationBlocked(RuntimeError):
+    """A migration needs data fixed by a person before it can run."""
+
+
+# most advanced first; statuses not listed rank just after "Under Review"
+STATUS_RANK = {status: rank for rank, status in enumerate(
+    ["Placed", "Selected", "Interview Scheduled", "Shortlisted", "Under Review", "Not Selected", "Rejected"])}
+_UNKNOWN_RANK = STATUS_RANK["Under Review"] + 0.5
+
+_DUPLICATES_SQL = """
+    SELECT a.Application_ID, a.Student_ID, a.Job_ID, a.Application_Status, a.Cover_Letter
+    FROM APPLICATION a
+    JOIN (SELECT Student_ID, Job_ID FROM APPLICATION
+          GROUP BY Student_ID, Job_ID HAVING COUNT(*) > 1) d
+      ON a.Student_ID = d.Student_ID AND a.Job_ID = d.Job_ID
+    ORDER BY a.Student_ID, a.Job_ID, a.Application_ID
+"""
+
+
+def _group_duplicates(rows):
+    """{(student_id, job_id): [rows]} from _DUPLICATES_SQL rows (dicts)."""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["Student_ID"], row["Job_ID"]), []).append(row)
+    return groups
+
+
+def describe_duplicates(groups, limit=20):
+    lines = [f"  student {sid}, job {jid}: " +
+             ", ".join(f"#{r['Application_ID']} ({r['Application_Status']})" for r in rows)
+             for (sid, jid), rows in list(groups.items())[:limit]]
+    if len(groups) > limit:
+        lines.append(f"  ... and {len(groups) - limit} more")
+    return "\n".join(lines)
+
+
+def refuse_duplicate_applications(cursor):
+    """Step that stops the migration while a student has several applications to one job."""
+    cursor.execute(_DUPLICATES_SQL)
+    names = [d[0] for d in cursor.description]
+    groups = _group_duplicates(dict(zip(names, row)) for row in cursor.fetchall())
+    if groups:
+        raise MigrationBlocked(
+            f"{len(groups)} student/job pairs have more than one application, so the unique "
+            f"(Student_ID, Job_ID) key cannot be added yet:\n{describe_duplicates(groups)}\n"
+            "Delete the unwanted rows, or run `python migrations.py duplicates --merge` to keep "
+            "the most advanced application of each pair, then restart the app."
+        )
+
+
+def merge_duplicate_applications():
+    """
+    Officer-invoked resolution: keep each pair's most advanced application
+    (earliest on a tie), give it a cover letter from the others if it has
+    none, move every interview onto it and delete the rest, in one
+    transaction. Returns the groups that were merged.
+    """
+    with transaction() as tx:
+        groups = _group_duplicates(tx.query(_DUPLICATES_SQL + " FOR UPDATE"))
+        for rows in groups.values():
+            keep = min(rows, key=lambda r: (STATUS_RANK.get(r["Application_Status"], _UNKNOWN_RANK),
+                                            r["Application_ID"]))
+            others = [r["Application_ID"] for r in rows if r is not keep]
+            ids = ", ".join(["%s"] * len(others))
+            if not keep["Cover_Letter"]:
+                letter = next((r["Cover_Letter"] for r in rows if r["Cover_Letter"]), None)
+                if letter:
+                    tx.execute("UPDATE APPLICATION SET Cover_Letter=%s WHERE Application_ID=%s",
+                               (letter, keep["Application_ID"]))
+            tx.execute(f"UPDATE INTERVIEW SET Application_ID=%s WHERE Application_ID IN ({ids})",
+                       (keep["Application_ID"], *others))
+            tx.execute(f"DELETE FROM APPLICATION WHERE Application_ID IN ({ids})", tuple(others))
+    return groups
+
+
+# ---------------- MIGRATIONS ---------------- #
+# (version, description, steps). Append new entries; never edit applied ones.
+MIGRATIONS = [
+    (1, "base tables", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS STUDENT (
+                Student_ID INT PRIMARY KEY AUTO_INCREMENT,
+                First_Name VARCHAR(50) NOT NULL,
+                Last_Name VARCHAR(50),
+                Email VARCHAR(100),
+                Phone VARCHAR(15),
+                CGPA FLOAT,
+                Placement_Status VARCHAR(50) DEFAULT 'Pending'
+            )
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS COMPANY (
+                Company_ID INT PRIMARY KEY AUTO_INCREMENT,
+                Company_Name VARCHAR(100) NOT NULL,
+                Company_Type VARCHAR(50),
+                Phone VARCHAR(15),
+                Industry_Type VARCHAR(50),
+                Email VARCHAR(100),
+                Website VARCHAR(200),
+                Address TEXT
+            )
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS JOB_POSTING (
+                Job_ID INT PRIMARY KEY AUTO_INCREMENT,
+                Company_ID INT NOT NULL,
+                Job_Title VARCHAR(100) NOT NULL,
+                Job_Description TEXT,
+                Salary_Package DECIMAL(12,2),
+                Location VARCHAR(100),
+                Minimum_CGPA FLOAT DEFAULT 0,
+                Application_Deadline DATE,
+                Number_of_Positions INT DEFAULT 1,
+                FOREIGN KEY (Company_ID) REFERENCES COMPANY(Company_ID)
+            )
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS APPLICATION (
+                Application_ID INT PRIMARY KEY AUTO_INCREMENT,
+                Student_ID INT NOT NULL,
+                Job_ID INT NOT NULL,
+                Application_Date DATE,
+                Application_Status VARCHAR(50) DEFAULT 'Under Review',
+                Cover_Letter TEXT,
+                FOREIGN KEY (Student_ID) REFERENCES STUDENT(Student_ID),
+                FOREIGN KEY (Job_ID) REFERENCES JOB_POSTING(Job_ID)
+            )
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS INTERVIEW (
+                Interview_ID INT PRIMARY KEY AUTO_INCREMENT,
+                Application_ID INT NOT NULL,
+                Interview_Date DATE,
+                Interview_Round VARCHAR(50),
+                Result VARCHAR(50) DEFAULT 'Pending',
+                FOREIGN KEY (Application_ID) REFERENCES APPLICATION(Application_ID)
+            )
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS PLACEMENT_OFFICER (
+                Officer_ID INT PRIMARY KEY AUTO_INCREMENT,
+                Officer_Name VARCHAR(100),
+                Email VARCHAR(100) NOT NULL,
+                Password VARCHAR(255) NOT NULL
+            )
+        """),
+        sql("""
+            INSERT INTO PLACEMENT_OFFICER (Officer_Name, Email, Password)
+            SELECT 'Admin', 'admin@college.com', 'admin123'
+            FROM DUAL WHERE NOT EXISTS (SELECT 1 FROM PLACEMENT_OFFICER)
+        """),
+    ]),
+    (2, "STUDENT.Placement_Status for hand-made schemas", [
+        add_column("STUDENT", "Placement_Status", "VARCHAR(50) DEFAULT 'Pending'"),
+    ]),
+    (3, "indexes for portal queries", [
+        # student dashboard: my applications / my interviews
+        add_index("APPLICATION", "idx_application_student_date", ["Student_ID", "Application_Date"]),
+        add_index("APPLICATION", "idx_application_job", ["Job_ID"]),
+        add_index("INTERVIEW", "idx_interview_application_date", ["Application_ID", "Interview_Date"]),
+        # job listings by company / ordered by salary
+        add_index("JOB_POSTING", "idx_job_company_salary", ["Company_ID", "Salary_Package"]),
+        add_index("JOB_POSTING", "idx_job_salary", ["Salary_Package"]),
+        # officer keyset pagination and filters
+        add_index("APPLICATION", "idx_application_date_id", ["Application_Date", "Application_ID"]),
+        add_index("APPLICATION", "idx_application_status", ["Application_Status"]),
+        add_index("INTERVIEW", "idx_interview_date_id", ["Interview_Date", "Interview_ID"]),
+        add_index("STUDENT", "idx_student_first_name", ["First_Name"]),
+        add_index("STUDENT", "idx_student_last_name", ["Last_Name"]),
+        add_index("STUDENT", "idx_student_cgpa", ["CGPA"]),
+        add_index("STUDENT", "idx_student_placement_status", ["Placement_Status"]),
+        add_index("COMPANY", "idx_company_name", ["Company_Name"]),
+        # officer login (student login is a primary-key lookup)
+        add_index("PLACEMENT_OFFICER", "idx_officer_email", ["Email"]),
+    ]),
+    (4, "eligibility criteria and materialized ELIGIBILITY matrix", [
+        add_column("STUDENT", "Branch", "VARCHAR(50)"),
+        add_column("STUDENT", "Backlogs", "INT DEFAULT 0"),
+        add_column("STUDENT", "Graduation_Year", "INT"),
+        add_column("JOB_POSTING", "Eligible_Branches", "VARCHAR(255)"),
+        add_column("JOB_POSTING", "Max_Backlogs", "INT"),
+        add_column("JOB_POSTING", "Graduation_Year", "INT"),
+        add_column("JOB_POSTING", "Allow_Placed", "TINYINT(1) NOT NULL DEFAULT 0"),
+        sql("""
+            CREATE TABLE IF NOT EXISTS ELIGIBILITY (
+                Student_ID INT NOT NULL,
+                Job_ID INT NOT NULL,
+                PRIMARY KEY (Student_ID, Job_ID),
+                KEY idx_eligibility_job (Job_ID, Student_ID),
+                FOREIGN KEY (Student_ID) REFERENCES STUDENT(Student_ID) ON DELETE CASCADE,
+                FOREIGN KEY (Job_ID) REFERENCES JOB_POSTING(Job_ID) ON DELETE CASCADE
+            )
+        """),
+        sql("DELETE FROM ELIGIBILITY"),
+        sql(f"INSERT INTO ELIGIBILITY (Student_ID, Job_ID) {ELIGIBLE_PAIRS_SQL}"),
+    ]),
+    (5, "Updated_At change tracking for incremental analytics", [
+        add_column("APPLICATION", "Updated_At",
+                   "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+        add_column("INTERVIEW", "Updated_At",
+                   "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+        add_index("APPLICATION", "idx_application_updated", ["Updated_At"]),
+        add_index("INTERVIEW", "idx_interview_updated", ["Updated_At"]),
+    ]),
+    (6, "one application per student and job, idempotent submits", [
+        # duplicates are never merged automatically: an officer resolves them first
+        refuse_duplicate_applications,
+        add_index("APPLICATION", "uq_application_student_job", ["Student_ID", "Job_ID"], kind="UNIQUE"),
+        add_column("APPLICATION", "Idempotency_Key", "VARCHAR(64) NULL"),
+        add_index("APPLICATION", "uq_application_idempotency", ["Idempotency_Key"], kind="UNIQUE"),
+    ]),
+    (7, "STUDENT.Profile_Version for session profile revalidation", [
+        add_column("STUDENT", "Profile_Version", "INT NOT NULL DEFAULT 1"),
+    ]),
+    (8, "Updated_At change tracking for the job search index", [
+        add_column("JOB_POSTING", "Updated_At",
+                   "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+        add_column("COMPANY", "Updated_At",
+                   "TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+        add_index("JOB_POSTING", "idx_job_posting_updated", ["Updated_At"]),
+        add_index("COMPANY", "idx_company_updated", ["Updated_At"]),
+    ]),
+    (9, "materialized PLACEMENT_SUMMARY per student", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS PLACEMENT_SUMMARY (
+                Student_ID INT PRIMARY KEY,
+                Current_Status VARCHAR(50) NOT NULL DEFAULT 'Pending',
+                Applications INT NOT NULL DEFAULT 0,
+                Offers INT NOT NULL DEFAULT 0,
+                Best_Offer_Job_ID INT NULL,
+                Best_Offer_Salary DECIMAL(12,2) NULL,
+                Latest_Interview_ID INT NULL,
+                Latest_Round VARCHAR(50) NULL,
+                Latest_Result VARCHAR(50) NULL,
+                Latest_Interview_Date DATE NULL,
+                Updated_At TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_summary_status (Current_Status, Student_ID),
+                FOREIGN KEY (Student_ID) REFERENCES STUDENT(Student_ID) ON DELETE CASCADE
+            )
+        """),
+        # fill it and bring STUDENT.Placement_Status (and so eligibility) in line with it
+        sql(UPSERT_SQL.format(select=SUMMARY_SQL.format(where="1=1"))),
+        sql(f"""
+            UPDATE STUDENT s JOIN PLACEMENT_SUMMARY p ON p.Student_ID = s.Student_ID
+            SET s.Placement_Status = p.Current_Status, {BUMP_VERSION}
+            WHERE NOT (s.Placement_Status <=> p.Current_Status)
+        """),
+        sql("DELETE FROM ELIGIBILITY"),
+        sql(f"INSERT INTO ELIGIBILITY (Student_ID, Job_ID) {ELIGIBLE_PAIRS_SQL}"),
+    ]),
+    (10, "STATUS_EVENT change feed for student notifications", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS STATUS_EVENT (
+                Event_ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+                Student_ID INT NOT NULL,
+                Kind VARCHAR(30) NOT NULL,
+                Application_ID INT NULL,
+                Interview_ID INT NULL,
+                Message VARCHAR(255),
+                Seen TINYINT(1) NOT NULL DEFAULT 0,
+                Created_At TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_status_event_student (Student_ID, Event_ID),
+                FOREIGN KEY (Student_ID) REFERENCES STUDENT(Student_ID) ON DELETE CASCADE
+            )
+        """),
+    ]),
+    (11, "drop the redundant STUDENT login index", [
+        # student login is already a primary-key point read; the index only slowed writes
+        drop_index("STUDENT", "idx_student_login"),
+    ]),
+]
+
+
+def migrate():
+    """
+    Apply every migration newer than the recorded schema version.
+    A MySQL named lock keeps concurrent app processes from racing.
+    Returns the list of versions applied by this call.
+    """
+    conn = get_connection()
+    if not conn:
+        st.stop()
+    cursor = conn.cursor()
+    applied = []
+    try:
+        cursor.execute("SELECT GET_LOCK('placement_schema_migrations', 60)")
+        if cursor.fetchall()[0][0] != 1:
+            raise RuntimeError("Timed out waiting for another process to finish migrating.")
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS SCHEMA_VERSION (
+                    Version INT PRIMARY KEY,
+                    Description VARCHAR(200),
+                    Applied_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("SELECT COALESCE(MAX(Version), 0) FROM SCHEMA_VERSION")
+            current = cursor.fetchall()[0][0]
+            for version, description, steps in MIGRATIONS:
+                if version <= current:
+                    continue
+                for step in steps:
+                    step(cursor)
+                cursor.execute(
+                    "INSERT INTO SCHEMA_VERSION (Version, Description) VALUES (%s, %s)",
+                    (version, description),
+                )
+                conn.commit()
+                applied.append(version)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK('placement_schema_migrations')")
+            cursor.fetchall()
+    finally:
+        cursor.close()
+        release_connection(conn)
+    if applied:
+        invalidate_tables(None)
+    return applied
+
+
+@st.cache_resource(show_spinner="Preparing database…")
+def ensure_schema():
+    """Run migrate() once per server process (re-run after a hot-reload of this module)."""
+    try:
+        return migrate()
+    except MigrationBlocked as e:
+        st.error(f"❌ Database upgrade stopped.\n\n```\n{e}\n```")
+        st.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schema migrations and the data fixes they may need.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="apply pending migrations")
+    duplicates = commands.add_parser("duplicates", help="list students with several applications to one job")
+    duplicates.add_argument("--merge", action="store_true",
+                            help="keep the most advanced application of each pair and delete the others")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        print(f"applied migrations: {migrate() or 'none'}")
+    elif args.merge:
+        groups = merge_duplicate_applications()
+        print(f"merged {len(groups)} student/job pairs:\n{describe_duplicates(groups, limit=len(groups))}")
+    else:
+        groups = _group_duplicates(run_query(_DUPLICATES_SQL, ttl=0))
+        print(describe_duplicates(groups, limit=len(groups)) if groups else "no duplicate applications")
+
+
+if __name__ == "__main__":
+    main()
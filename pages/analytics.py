@@ -0,0 +1,38 @@
+# pages/analytics.py
+import streamlit as st
+from placement_analytics import get_analytics_store
+
+
+def show_analytics():
+    st.subheader("📊 Placement Analytics")
+    store = get_analytics_store()
+    with st.spinner("Loading placement data…"):
+        store.refresh()
+    results = store.results
+    info = store.last_refresh
+    st.caption(
+        f"{info['applications']} applications · {info['interviews']} interviews · "
+        f"{info['rows_changed']} changed rows pulled at {store.refreshed_at} ({info['ms']} ms)"
+    )
+
+    cols = st.columns(len(results["overall"]))
+    for col, (label, value) in zip(cols, results["overall"].items()):
+        col.metric(label, value)
+
+    st.markdown("### 🔻 Offer Funnel")
+    funnel = results["funnel"]
+    st.bar_chart(funnel.set_index("Stage")["Applications"])
+    st.dataframe(funnel, use_container_width=True, hide_index=True)
+
+    st.markdown("### 🏢 Placement Rate by Company")
+    st.dataframe(results["by_company"], use_container_width=True, hide_index=True)
+
+    st.markdown("### 💰 Salary Distribution of Offers")
+    st.dataframe(results["salary"], use_container_width=True, hide_index=True)
+
+    st.markdown("### 🎓 CGPA vs Outcome")
+    cgpa = results["cgpa"]
+    st.dataframe(cgpa, use_container_width=True, hide_index=True)
+    outcomes = [c for c in ("Selected", "Rejected", "In progress") if c in cgpa]
+    if outcomes:
+        st.bar_chart(cgpa.set_index("CGPA_Band")[outcomes])
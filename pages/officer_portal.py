@@ -1,190 +1,614 @@
 # pages/officer_portal.py
+import os
+
+import pandas as pd
 import streamlit as st
-from db_connection import run_query, run_commit
+from db_connection import run_query, run_commit, pool_stats, cache_stats, transaction, query_tracker
+from bulk_import import IMPORT_SPECS, DEFAULT_BATCH_SIZE, read_upload, validate, insert_rows
+from pagination import Filters, name_filter, show_paginated
+from profiling import get_profiler, mark_section, bucket_labels
+from eligibility import normalize_branches, refresh_jobs
+from pages.analytics import show_analytics
+from exports import REPORTS, FORMATS, DEFAULT_CHUNK_SIZE, SPOOL_MAX_AGE_SECONDS, export, purge_spool, spool_file
+from interview_drive import (drive_candidates, slot_dates, schedule_round, job_rounds, round_interviews,
+                             changed_results, parse_results, record_results)
+from placement_summary import PLACEMENT_STATUSES
+import placement_summary
+import status_events
 
-def show_officer_portal(officer):
-    st.header("🧑‍💼 Placement Officer Dashboard")
-    st.markdown(f"**Welcome, {officer.get('Officer_Name', officer.get('Email','Officer'))}**")
+APPLICATION_STATUSES = ["Under Review", "Shortlisted", "Interview Scheduled", "Selected", "Rejected"]
+INTERVIEW_RESULTS = ["Pending", "Shortlisted", "Selected", "Rejected"]
 
-    tabs = st.tabs(["Companies", "Job Postings", "Applications", "Interviews", "Students"])
-
-    # ---------------- COMPANIES TAB ---------------- #
-    with tabs[0]:
-        st.subheader("🏢 Companies")
-        companies = run_query("SELECT * FROM COMPANY ORDER BY Company_ID")
-        st.dataframe(companies, use_container_width=True)
-
-        with st.expander("➕ Add New Company"):
-            name = st.text_input("Company Name", key="comp_name")
-            ctype = st.text_input("Company Type", key="comp_type")
-            phone = st.text_input("Phone", key="comp_phone")
-            industry = st.text_input("Industry Type", key="comp_ind")
-            email = st.text_input("Email", key="comp_email")
-            website = st.text_input("Website", key="comp_web")
-            address = st.text_area("Address", key="comp_addr")
-            if st.button("Add Company"):
-                run_commit("""
-                    INSERT INTO COMPANY (Company_Name, Company_Type, Phone, Industry_Type, Email, Website, Address)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s)
-                """, (name, ctype, phone, industry, email, website, address))
-                st.success("✅ Company added successfully.")
-
-    # ---------------- JOB POSTINGS TAB ---------------- #
-    with tabs[1]:
-        st.subheader("💼 Job Postings")
-        jobs = run_query("""
-            SELECT j.Job_ID, j.Job_Title, c.Company_Name, j.Salary_Package, j.Location,
-                   j.Minimum_CGPA, j.Application_Deadline
-            FROM JOB_POSTING j
-            JOIN COMPANY c ON j.Company_ID = c.Company_ID
-            ORDER BY j.Job_ID DESC
-        """)
-        st.dataframe(jobs, use_container_width=True)
-
-        with st.expander("➕ Post New Job"):
-            company_id = st.number_input("Company ID", min_value=1, key="new_job_company")
-            title = st.text_input("Job Title", key="new_job_title")
-            desc = st.text_area("Description", key="new_job_desc")
-            salary = st.number_input("Salary Package", min_value=0.0, key="new_job_salary")
-            loc = st.text_input("Location", key="new_job_loc")
-            min_cgpa = st.number_input("Minimum CGPA", min_value=0.0, max_value=10.0, step=0.1, key="new_job_min_cgpa")
-            deadline = st.date_input("Application Deadline", key="new_job_deadline")
-            vacancies = st.number_input("Number of Positions", min_value=1, key="new_job_vacancies")
-            if st.button("Post Job"):
-                run_commit("""
+# ---------------- STATEMENTS ---------------- #
+# Shared with benchmarks/bench_portal.py so load tests replay exactly what the portal runs.
+COMPANY_OPTIONS_SQL = "SELECT Company_ID, Company_Name FROM COMPANY ORDER BY Company_Name"
+COMPANIES_SQL = "SELECT * FROM COMPANY ORDER BY Company_ID"
+JOB_POSTINGS_SQL = """
+    SELECT j.Job_ID, j.Job_Title, c.Company_Name, j.Salary_Package, j.Location,
+           j.Minimum_CGPA, j.Eligible_Branches, j.Max_Backlogs, j.Graduation_Year,
+           j.Application_Deadline
+    FROM JOB_POSTING j
+    JOIN COMPANY c ON j.Company_ID = c.Company_ID
+    ORDER BY j.Job_ID DESC
+"""
+
+# show_paginated() arguments for each officer list; the first sort option is the default
+APPLICATIONS_LIST = {
+    "from_sql": """FROM APPLICATION a
+           JOIN STUDENT s ON a.Student_ID = s.Student_ID
+           JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+           JOIN COMPANY c ON j.Company_ID = c.Company_ID""",
+    "columns": """a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name, j.Job_Title,
+           c.Company_Name, a.Application_Date, a.Application_Status""",
+    "sort_options": {"Application date": ("a.Application_Date", "Application_Date"),
+                     "Application ID": ("a.Application_ID", "Application_ID")},
+    "key_column": ("a.Application_ID", "Application_ID"),
+}
+INTERVIEWS_LIST = {
+    "from_sql": """FROM INTERVIEW i
+           JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+           JOIN STUDENT s ON a.Student_ID = s.Student_ID
+           JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+           JOIN COMPANY c ON j.Company_ID = c.Company_ID""",
+    "columns": """i.Interview_ID, a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name,
+           j.Job_Title, c.Company_Name, i.Interview_Date, i.Interview_Round, i.Result""",
+    "sort_options": {"Interview date": ("i.Interview_Date", "Interview_Date"),
+                     "Interview ID": ("i.Interview_ID", "Interview_ID")},
+    "key_column": ("i.Interview_ID", "Interview_ID"),
+}
+STUDENTS_LIST = {
+    # status filters use PLACEMENT_SUMMARY's (Current_Status, Student_ID) index
+    "from_sql": "FROM STUDENT s LEFT JOIN PLACEMENT_SUMMARY p ON p.Student_ID = s.Student_ID",
+    "columns": """s.Student_ID, s.First_Name, s.Last_Name, s.Email, s.Phone, s.Branch, s.CGPA,
+           p.Current_Status AS Placement_Status, p.Applications, p.Offers, p.Best_Offer_Salary,
+           p.Latest_Round, p.Latest_Result""",
+    "sort_options": {"Student ID": ("s.Student_ID", "Student_ID"),
+                     "CGPA": ("s.CGPA", "CGPA"),
+                     "Last name": ("s.Last_Name", "Last_Name")},
+    "key_column": ("s.Student_ID", "Student_ID"),
+}
+ELIGIBLE_STUDENTS_LIST = {
+    "from_sql": "FROM ELIGIBILITY e JOIN STUDENT s ON e.Student_ID = s.Student_ID",
+    "columns": "s.Student_ID, s.First_Name, s.Last_Name, s.Branch, s.CGPA, s.Backlogs, s.Graduation_Year, s.Placement_Status",
+    "sort_options": {"Student ID": ("e.Student_ID", "Student_ID")},
+    "key_column": ("e.Student_ID", "Student_ID"),
+}
+
+
+def _company_job_filters(filters, key):
+    """Company / job dropdowns shared by several sections; returns (company_id, job_id)."""
+    companies = run_query(COMPANY_OPTIONS_SQL, ttl=300)
+    names = {c["Company_ID"]: c["Company_Name"] for c in companies}
+    company_id = st.selectbox("Company", [None] + list(names), key=f"{key}_company",
+                              format_func=lambda cid: "All companies" if cid is None else names[cid])
+    if company_id is None:
+        return None, None
+    filters.add("j.Company_ID = %s", company_id)
+    jobs = run_query("SELECT Job_ID, Job_Title FROM JOB_POSTING WHERE Company_ID=%s ORDER BY Job_Title",
+                     (company_id,))
+    titles = {j["Job_ID"]: j["Job_Title"] for j in jobs}
+    job_id = st.selectbox("Job", [None] + list(titles), key=f"{key}_job",
+                          format_func=lambda jid: "All jobs" if jid is None else f"#{jid} {titles[jid]}")
+    if job_id is not None:
+        filters.add("j.Job_ID = %s", job_id)
+    return company_id, job_id
+
+
+def _date_filter(filters, key, label, column):
+    picked = st.date_input(label, value=(), key=f"{key}_dates")
+    if len(picked) == 2:
+        filters.add(f"{column} BETWEEN %s AND %s", picked[0], picked[1])
+
+
+def _cgpa_filter(filters, key):
+    low, high = st.slider("CGPA band", 0.0, 10.0, (0.0, 10.0), 0.1, key=f"{key}_cgpa")
+    if (low, high) != (0.0, 10.0):
+        filters.add("s.CGPA BETWEEN %s AND %s", low, high)
+
+
+def _eligibility_inputs(key):
+    """Branch / backlog / graduation-year criteria widgets for a job posting."""
+    c1, c2, c3 = st.columns(3)
+    branches = normalize_branches(c1.text_input("Eligible Branches (comma separated, blank = all)",
+                                                key=f"{key}_branches"))
+    max_backlogs = c2.number_input("Max Backlogs (-1 = no limit)", min_value=-1, value=-1, key=f"{key}_backlogs")
+    grad_year = c3.number_input("Graduation Year (0 = any)", min_value=0, value=0, key=f"{key}_year")
+    allow_placed = st.checkbox("Allow already-placed students", key=f"{key}_allow_placed")
+    return (branches, None if max_backlogs < 0 else int(max_backlogs),
+            int(grad_year) or None, int(allow_placed))
+
+
+# ---------------- COMPANIES ---------------- #
+def _companies_section():
+    st.subheader("🏢 Companies")
+    companies = run_query(COMPANIES_SQL)
+    st.dataframe(companies, use_container_width=True)
+
+    with st.expander("➕ Add New Company"):
+        name = st.text_input("Company Name", key="comp_name")
+        ctype = st.text_input("Company Type", key="comp_type")
+        phone = st.text_input("Phone", key="comp_phone")
+        industry = st.text_input("Industry Type", key="comp_ind")
+        email = st.text_input("Email", key="comp_email")
+        website = st.text_input("Website", key="comp_web")
+        address = st.text_area("Address", key="comp_addr")
+        if st.button("Add Company"):
+            run_commit("""
+                INSERT INTO COMPANY (Company_Name, Company_Type, Phone, Industry_Type, Email, Website, Address)
+                VALUES (%s,%s,%s,%s,%s,%s,%s)
+            """, (name, ctype, phone, industry, email, website, address))
+            st.success("✅ Company added successfully.")
+
+
+# ---------------- JOB POSTINGS ---------------- #
+def _job_postings_section():
+    st.subheader("💼 Job Postings")
+    jobs = run_query(JOB_POSTINGS_SQL)
+    st.dataframe(jobs, use_container_width=True)
+
+    with st.expander("➕ Post New Job"):
+        company_id = st.number_input("Company ID", min_value=1, key="new_job_company")
+        title = st.text_input("Job Title", key="new_job_title")
+        desc = st.text_area("Description", key="new_job_desc")
+        salary = st.number_input("Salary Package", min_value=0.0, key="new_job_salary")
+        loc = st.text_input("Location", key="new_job_loc")
+        min_cgpa = st.number_input("Minimum CGPA", min_value=0.0, max_value=10.0, step=0.1, key="new_job_min_cgpa")
+        deadline = st.date_input("Application Deadline", key="new_job_deadline")
+        vacancies = st.number_input("Number of Positions", min_value=1, key="new_job_vacancies")
+        branches, max_backlogs, grad_year, allow_placed = _eligibility_inputs("new_job")
+        if st.button("Post Job"):
+            with transaction() as tx:
+                tx.execute("""
                     INSERT INTO JOB_POSTING (Company_ID, Job_Title, Job_Description, Salary_Package,
-                                             Location, Minimum_CGPA, Application_Deadline, Number_of_Positions)
-                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-                """, (company_id, title, desc, salary, loc, min_cgpa, deadline, vacancies))
-                st.success("✅ Job posted successfully.")
-
-    # ---------------- APPLICATIONS TAB ---------------- #
-    with tabs[2]:
-        st.subheader("📋 Applications")
-        apps = run_query("""
-            SELECT a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name, j.Job_Title, 
-                   c.Company_Name, a.Application_Date, a.Application_Status
-            FROM APPLICATION a
-            JOIN STUDENT s ON a.Student_ID = s.Student_ID
-            JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
-            JOIN COMPANY c ON j.Company_ID = c.Company_ID
-            ORDER BY a.Application_Date DESC
-        """)
-        st.dataframe(apps, use_container_width=True)
-
-        st.markdown("### ✏️ Update Application Status")
-        app_id = st.number_input("Application ID", min_value=1, key="update_app_id")
-        new_status = st.selectbox("New Status", 
-                                  ["Under Review", "Shortlisted", "Interview Scheduled", "Selected", "Rejected"],
-                                  key="update_app_status")
-        if st.button("Update Status"):
-            run_commit("UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID=%s", 
+                                             Location, Minimum_CGPA, Application_Deadline, Number_of_Positions,
+                                             Eligible_Branches, Max_Backlogs, Graduation_Year, Allow_Placed)
+                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                """, (company_id, title, desc, salary, loc, min_cgpa, deadline, vacancies,
+                      branches, max_backlogs, grad_year, allow_placed))
+                refresh_jobs(tx, [tx.lastrowid])
+            st.success("✅ Job posted successfully.")
+
+    with st.expander("✏️ Update Eligibility Criteria"):
+        job_id = st.number_input("Job ID", min_value=1, key="crit_job_id")
+        min_cgpa = st.number_input("Minimum CGPA", min_value=0.0, max_value=10.0, step=0.1, key="crit_min_cgpa")
+        branches, max_backlogs, grad_year, allow_placed = _eligibility_inputs("crit")
+        if st.button("Update Criteria"):
+            with transaction() as tx:
+                # the UPDATE's row count is 0 when the criteria are unchanged, so check existence apart
+                found = tx.query("SELECT Job_ID FROM JOB_POSTING WHERE Job_ID=%s FOR UPDATE", (job_id,))
+                if found:
+                    tx.execute("""
+                        UPDATE JOB_POSTING
+                        SET Minimum_CGPA=%s, Eligible_Branches=%s, Max_Backlogs=%s, Graduation_Year=%s, Allow_Placed=%s
+                        WHERE Job_ID=%s
+                    """, (min_cgpa, branches, max_backlogs, grad_year, allow_placed, job_id))
+                    refresh_jobs(tx, [job_id])
+            if found:
+                st.success(f"✅ Criteria for Job #{job_id} updated.")
+            else:
+                st.warning("⚠️ Job not found.")
+
+    st.markdown("### 👥 Eligible Students for a Job")
+    job_id = st.number_input("Job ID", min_value=1, key="elig_job_id")
+    filters = Filters().add("e.Job_ID = %s", job_id)
+    show_paginated("elig", filters=filters, **ELIGIBLE_STUDENTS_LIST)
+
+
+# ---------------- APPLICATIONS ---------------- #
+def _applications_section():
+    st.subheader("📋 Applications")
+    filters = Filters()
+    with st.expander("🔎 Filters", expanded=False):
+        f1, f2 = st.columns(2)
+        with f1:
+            _company_job_filters(filters, "apps")
+            statuses = st.multiselect("Status", APPLICATION_STATUSES, key="apps_status")
+            if statuses:
+                filters.add(f"a.Application_Status IN ({', '.join(['%s'] * len(statuses))})", *statuses)
+        with f2:
+            _date_filter(filters, "apps", "Applied between", "a.Application_Date")
+            _cgpa_filter(filters, "apps")
+            name_filter(filters, st.text_input("Student name or ID", key="apps_name"),
+                        "s.Student_ID", "s.First_Name", "s.Last_Name")
+    show_paginated("apps", filters=filters, **APPLICATIONS_LIST)
+
+    st.markdown("### ✏️ Update Application Status")
+    app_id = st.number_input("Application ID", min_value=1, key="update_app_id")
+    new_status = st.selectbox("New Status", APPLICATION_STATUSES, key="update_app_status")
+    if st.button("Update Status"):
+        with transaction() as tx:
+            placement_summary.lock_applications(tx, [app_id])
+            tx.execute("UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID=%s",
                        (new_status, app_id))
-            st.success("✅ Application status updated successfully.")
+            placement_summary.refresh_applications(tx, [app_id])
+            status_events.application_status(tx, [app_id])
+        st.success("✅ Application status updated successfully.")
 
-    # ---------------- INTERVIEWS TAB ---------------- #
-    with tabs[3]:
-        st.subheader("🗓 Interviews")
 
-        interviews = run_query("""
-            SELECT i.Interview_ID, a.Application_ID, s.Student_ID, s.First_Name, s.Last_Name,
-                   j.Job_Title, c.Company_Name, i.Interview_Date, i.Interview_Round, i.Result
-            FROM INTERVIEW i
-            JOIN APPLICATION a ON i.Application_ID = a.Application_ID
-            JOIN STUDENT s ON a.Student_ID = s.Student_ID
-            JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
-            JOIN COMPANY c ON j.Company_ID = c.Company_ID
-            ORDER BY i.Interview_Date DESC
-        """)
-        st.dataframe(interviews, use_container_width=True)
-
-        with st.expander("➕ Schedule New Interview"):
-            app_id = st.number_input("Application ID", min_value=1, key="sch_app_id")
-            date = st.date_input("Interview Date", key="sch_date")
-            round_name = st.text_input("Round (e.g. HR, Tech)", key="sch_round")
-            result = st.selectbox("Initial Result", ["Pending", "Shortlisted", "Selected", "Rejected"], key="sch_result")
-            if st.button("Schedule Interview"):
-                run_commit("""
+# ---------------- INTERVIEWS ---------------- #
+def _interviews_section():
+    st.subheader("🗓 Interviews")
+
+    filters = Filters()
+    with st.expander("🔎 Filters", expanded=False):
+        f1, f2 = st.columns(2)
+        with f1:
+            _company_job_filters(filters, "ints")
+            results = st.multiselect("Result", INTERVIEW_RESULTS + ["Placed", "Not Placed"], key="ints_result")
+            if results:
+                filters.add(f"i.Result IN ({', '.join(['%s'] * len(results))})", *results)
+        with f2:
+            _date_filter(filters, "ints", "Interview between", "i.Interview_Date")
+            _cgpa_filter(filters, "ints")
+            name_filter(filters, st.text_input("Student name or ID", key="ints_name"),
+                        "s.Student_ID", "s.First_Name", "s.Last_Name")
+    show_paginated("ints", filters=filters, **INTERVIEWS_LIST)
+
+    with st.expander("➕ Schedule New Interview"):
+        app_id = st.number_input("Application ID", min_value=1, key="sch_app_id")
+        date = st.date_input("Interview Date", key="sch_date")
+        round_name = st.text_input("Round (e.g. HR, Tech)", key="sch_round")
+        result = st.selectbox("Initial Result", INTERVIEW_RESULTS, key="sch_result")
+        if st.button("Schedule Interview"):
+            with transaction() as tx:
+                placement_summary.lock_applications(tx, [app_id])
+                tx.execute("""
                     INSERT INTO INTERVIEW (Application_ID, Interview_Date, Interview_Round, Result)
                     VALUES (%s,%s,%s,%s)
                 """, (app_id, date, round_name, result))
-                run_commit("UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID=%s", 
+                interview_id = tx.lastrowid
+                tx.execute("UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID=%s",
                            ("Interview Scheduled", app_id))
-                st.success("✅ Interview scheduled successfully.")
-
-        st.markdown("---")
-        st.subheader("🔄 Update Interview Result")
-        int_id = st.number_input("Interview ID", min_value=1, key="upd_int_id")
-        new_result = st.selectbox("Set Result", ["Pending", "Shortlisted", "Selected", "Rejected"], key="upd_result")
-        if st.button("Update Interview Result"):
-            run_commit("UPDATE INTERVIEW SET Result=%s WHERE Interview_ID=%s", (new_result, int_id))
-            run_commit("""
+                placement_summary.refresh_applications(tx, [app_id])
+                status_events.interviews_scheduled(tx, [interview_id])
+            st.success("✅ Interview scheduled successfully.")
+
+    st.markdown("---")
+    st.subheader("🔄 Update Interview Result")
+    int_id = st.number_input("Interview ID", min_value=1, key="upd_int_id")
+    new_result = st.selectbox("Set Result", INTERVIEW_RESULTS, key="upd_result")
+    if st.button("Update Interview Result"):
+        with transaction() as tx:
+            placement_summary.lock_interviews(tx, [int_id])
+            tx.execute("UPDATE INTERVIEW SET Result=%s WHERE Interview_ID=%s", (new_result, int_id))
+            tx.execute("""
                 UPDATE APPLICATION
                 SET Application_Status = %s
                 WHERE Application_ID = (SELECT Application_ID FROM INTERVIEW WHERE Interview_ID=%s)
             """, (new_result, int_id))
-            st.success(f"✅ Interview #{int_id} updated to '{new_result}'.")
-
-        # ---------------- MANUAL STUDENT PLACEMENT RESULT ---------------- #
-        st.markdown("---")
-        st.subheader("🎯 Update Student Placement Result")
-
-        student_id = st.number_input("Enter Student ID", min_value=1, key="place_student_id")
-        if st.button("Fetch Student Interviews"):
-            interviews = run_query("""
-                SELECT i.Interview_ID, j.Job_Title, c.Company_Name, i.Interview_Date, i.Result
-                FROM INTERVIEW i
-                JOIN APPLICATION a ON i.Application_ID = a.Application_ID
-                JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
-                JOIN COMPANY c ON j.Company_ID = c.Company_ID
-                WHERE a.Student_ID = %s
-                ORDER BY i.Interview_Date DESC
-            """, (student_id,))
-
-            if interviews:
-                st.write("### Student’s Interview History")
-                st.dataframe(interviews, use_container_width=True)
-
-                interview_ids = [str(i["Interview_ID"]) for i in interviews]
-                chosen_interview = st.selectbox("Select Interview ID to mark placement result", interview_ids)
-                final_result = st.selectbox("Set Final Result", ["Placed", "Not Placed", "Pending"])
-
-                if st.button("Update Placement Result"):
+            placement_summary.refresh_interviews(tx, [int_id])
+            status_events.interview_results(tx, [int_id])
+        st.success(f"✅ Interview #{int_id} updated to '{new_result}'.")
+
+    # ---------------- MANUAL STUDENT PLACEMENT RESULT ---------------- #
+    st.markdown("---")
+    st.subheader("🎯 Update Student Placement Result")
+
+    student_id = st.number_input("Enter Student ID", min_value=1, key="place_student_id")
+    # remember the fetch across reruns so the nested update button below can fire
+    if st.button("Fetch Student Interviews"):
+        st.session_state.place_fetched_id = student_id
+    if st.session_state.get("place_fetched_id") == student_id:
+        interviews = run_query("""
+            SELECT i.Interview_ID, j.Job_Title, c.Company_Name, i.Interview_Date, i.Result
+            FROM INTERVIEW i
+            JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+            JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+            JOIN COMPANY c ON j.Company_ID = c.Company_ID
+            WHERE a.Student_ID = %s
+            ORDER BY i.Interview_Date DESC
+        """, (student_id,))
+
+        if interviews:
+            st.write("### Student’s Interview History")
+            st.dataframe(interviews, use_container_width=True)
+
+            interview_ids = [str(i["Interview_ID"]) for i in interviews]
+            chosen_interview = st.selectbox("Select Interview ID to mark placement result", interview_ids,
+                                            key="place_interview")
+            final_result = st.selectbox("Set Final Result", ["Placed", "Not Placed", "Pending"],
+                                        key="place_result")
+
+            if st.button("Update Placement Result"):
+                with transaction() as tx:
+                    placement_summary.lock_interviews(tx, [chosen_interview])
                     # Update interview result
-                    run_commit("UPDATE INTERVIEW SET Result=%s WHERE Interview_ID=%s", (final_result, chosen_interview))
+                    tx.execute("UPDATE INTERVIEW SET Result=%s WHERE Interview_ID=%s", (final_result, chosen_interview))
 
                     # Update related application
-                    app_id_row = run_query("SELECT Application_ID FROM INTERVIEW WHERE Interview_ID=%s", (chosen_interview,))
+                    app_id_row = tx.query("SELECT Application_ID FROM INTERVIEW WHERE Interview_ID=%s", (chosen_interview,))
                     if app_id_row:
                         app_id = app_id_row[0]["Application_ID"]
                         status = "Placed" if final_result == "Placed" else "Not Selected" if final_result == "Not Placed" else "Under Review"
-                        run_commit("UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID=%s", (status, app_id))
-                        # Update student's placement status
-                        try:
-                            run_commit("ALTER TABLE STUDENT ADD COLUMN IF NOT EXISTS Placement_Status VARCHAR(50)")
-                        except Exception:
-                            pass
-                        run_commit("UPDATE STUDENT SET Placement_Status=%s WHERE Student_ID=%s", (final_result, student_id))
-                        st.success(f"✅ Student #{student_id} marked as '{final_result}' for Interview #{chosen_interview}.")
-                    else:
-                        st.warning("⚠️ Could not find application linked to this interview.")
-            else:
-                st.info("No interviews found for that student.")
-
-    # ---------------- STUDENTS TAB ---------------- #
-    with tabs[4]:
-        st.subheader("🎓 Students")
-        students = run_query("""
-            SELECT Student_ID, First_Name, Last_Name, Email, Phone, CGPA, Placement_Status
-            FROM STUDENT ORDER BY Student_ID
-        """)
-        st.dataframe(students, use_container_width=True)
-
-        st.markdown("### 🔍 View Detailed Student Profile")
-        student_id = st.number_input("Enter Student ID", min_value=1, key="view_student_id")
-        if st.button("Get Student Details"):
-            rows = run_query("SELECT * FROM STUDENT WHERE Student_ID=%s", (student_id,))
-            if rows:
-                st.json(rows[0])
+                        tx.execute("UPDATE APPLICATION SET Application_Status=%s WHERE Application_ID=%s", (status, app_id))
+                        # the summary derives the student's Placement_Status (and eligibility) from all
+                        # their applications, so an open application elsewhere keeps them Pending
+                        placement_summary.refresh_students(tx, [student_id])
+                        status_events.placement_results(tx, [chosen_interview])
+                if app_id_row:
+                    st.success(f"✅ Student #{student_id} marked as '{final_result}' for Interview #{chosen_interview}.")
+                else:
+                    st.warning("⚠️ Could not find application linked to this interview.")
+        else:
+            st.info("No interviews found for that student.")
+
+
+# ---------------- INTERVIEW DRIVE ---------------- #
+def _interview_drive_section():
+    st.subheader("📦 Interview Drive")
+    st.caption("Schedule a whole round for a job, then enter every result at once. "
+               "Each action is committed as one transaction.")
+    job_id = st.number_input("Job ID", min_value=1, key="drive_job")
+    # a radio rather than st.tabs so only the active step runs its queries
+    step = st.radio("Step", ["Schedule round", "Enter results"], horizontal=True, key="drive_step")
+    if step == "Schedule round":
+        _drive_schedule(job_id)
+    else:
+        _drive_results(job_id)
+
+
+def _drive_schedule(job_id):
+    statuses = st.multiselect("Applications with status", APPLICATION_STATUSES, default=["Shortlisted"],
+                              key="drive_statuses")
+    c1, c2, c3, c4 = st.columns(4)
+    round_name = c1.text_input("Round", value="Technical", key="drive_round").strip()
+    first_day = c2.date_input("First day", key="drive_first_day")
+    per_day = int(c3.number_input("Interviews per day", min_value=1, value=50, key="drive_per_day"))
+    skip_weekends = c4.checkbox("Skip weekends", value=True, key="drive_skip_weekends")
+
+    candidates = drive_candidates(job_id, statuses)
+    if not candidates:
+        st.info("No applications for this job match those statuses.")
+        return
+    grid = pd.DataFrame(candidates)
+    grid.insert(0, "Schedule", True)
+    grid["Interview_Date"] = slot_dates(len(grid), first_day, per_day, skip_weekends)
+    # new inputs -> new editor key, so stale per-row edits are dropped
+    signature = (job_id, tuple(statuses), first_day, per_day, skip_weekends, tuple(grid["Application_ID"]))
+    edited = st.data_editor(
+        grid, key=f"drive_slots_{abs(hash(signature))}", hide_index=True, use_container_width=True,
+        disabled=[c for c in grid.columns if c not in ("Schedule", "Interview_Date")],
+        column_config={"Interview_Date": st.column_config.DateColumn("Interview_Date", required=True)},
+    )
+    chosen = edited[edited["Schedule"]]
+    st.caption(f"{len(chosen)} of {len(grid)} applications selected, "
+               f"{len(set(chosen['Interview_Date']))} interview day(s).")
+    if st.button(f"Schedule {len(chosen)} '{round_name}' interviews", key="drive_schedule",
+                 disabled=chosen.empty or not round_name):
+        dates = pd.to_datetime(chosen["Interview_Date"]).dt.date
+        scheduled, skipped = schedule_round(zip(chosen["Application_ID"], dates), round_name)
+        st.success(f"✅ Scheduled {scheduled} '{round_name}' interviews."
+                   + (f" Skipped {skipped} that already had this round." if skipped else ""))
+
+
+def _drive_results(job_id):
+    rounds = job_rounds(job_id)
+    if not rounds:
+        st.info("No interviews scheduled for this job yet.")
+        return
+    round_name = st.selectbox("Round", rounds, key="drive_results_round")
+    original = pd.DataFrame(round_interviews(job_id, round_name))
+    if original.empty:
+        st.info("No interviews in this round.")
+        return
+    # results already set elsewhere (e.g. Placed) stay selectable so those rows still display
+    options = INTERVIEW_RESULTS + sorted(set(original["Result"].dropna()) - set(INTERVIEW_RESULTS))
+
+    entry = st.radio("Enter results by", ["Editing the grid", "Uploading a sheet"], horizontal=True,
+                     key="drive_entry")
+    if entry == "Editing the grid":
+        edited = st.data_editor(
+            original, key=f"drive_results_{job_id}_{round_name}", hide_index=True, use_container_width=True,
+            disabled=[c for c in original.columns if c != "Result"],
+            column_config={"Result": st.column_config.SelectboxColumn("Result", options=options, required=True)},
+        )
+        results = changed_results(original, edited)
+        label = f"Save {len(results)} changed results"
+    else:
+        st.caption("Columns: Interview_ID, Result. Start from the current round:")
+        st.download_button("⬇️ Download round as CSV",
+                           original[["Interview_ID", "First_Name", "Last_Name", "Result"]].to_csv(index=False),
+                           file_name=f"job_{job_id}_{round_name}_results.csv", mime="text/csv")
+        upload = st.file_uploader("Upload results", type=["csv", "xlsx", "xls"], key="drive_results_file")
+        results = []
+        if upload is not None:
+            try:
+                results, errors = parse_results(read_upload(upload), INTERVIEW_RESULTS,
+                                                set(original["Interview_ID"]))
+            except ImportError as e:
+                st.error(f"❌ Reading Excel files needs an extra package: {e}")
+            except ValueError as e:
+                st.error(f"❌ {e}")
             else:
-                st.warning("⚠️ Student not found.")
+                if len(errors):
+                    st.warning("⚠️ These rows will be skipped:")
+                    st.dataframe(errors, use_container_width=True)
+                current = dict(zip(original["Interview_ID"], original["Result"]))
+                results = [(i, r) for i, r in results if current.get(i) != r]
+        label = f"Apply {len(results)} changed results"
+
+    if st.button(label, key="drive_save_results", disabled=not results):
+        updated = record_results(results)
+        st.success(f"✅ Updated {updated} interviews and their applications in one transaction.")
+
+
+# ---------------- STUDENTS ---------------- #
+def _students_section():
+    st.subheader("🎓 Students")
+    filters = Filters()
+    with st.expander("🔎 Filters", expanded=False):
+        f1, f2 = st.columns(2)
+        with f1:
+            placement = st.multiselect("Placement Status", PLACEMENT_STATUSES, key="stu_status")
+            if placement:
+                filters.add(f"p.Current_Status IN ({', '.join(['%s'] * len(placement))})", *placement)
+            if st.checkbox("With an offer", key="stu_offers"):
+                filters.add("p.Offers > 0")
+            name_filter(filters, st.text_input("Student name or ID", key="stu_name"),
+                        "s.Student_ID", "s.First_Name", "s.Last_Name")
+        with f2:
+            _cgpa_filter(filters, "stu")
+    show_paginated("stu", filters=filters, **STUDENTS_LIST)
+
+    st.markdown("### 🔍 View Detailed Student Profile")
+    student_id = st.number_input("Enter Student ID", min_value=1, key="view_student_id")
+    if st.button("Get Student Details"):
+        rows = run_query("SELECT * FROM STUDENT WHERE Student_ID=%s", (student_id,))
+        if rows:
+            st.json(rows[0])
+            summary = placement_summary.student_summary(student_id)
+            if summary:
+                st.markdown("**Placement summary**")
+                st.json(summary)
+        else:
+            st.warning("⚠️ Student not found.")
+
+
+# ---------------- BULK IMPORT ---------------- #
+def _bulk_import_section():
+    st.subheader("📥 Bulk Import (CSV / Excel)")
+    kind = st.selectbox("Import", list(IMPORT_SPECS), key="bulk_kind")
+    spec = IMPORT_SPECS[kind]
+    st.caption(
+        f"Required columns: {', '.join(spec['required'])}. "
+        f"Optional: {', '.join(spec['optional'])}."
+        + (f" If present, {', '.join(spec['all_or_none'])} must be filled on every line." if spec["all_or_none"] else "")
+    )
+    upload = st.file_uploader("Upload file", type=["csv", "xlsx", "xls"], key="bulk_file")
+    batch_size = st.number_input("Batch size (rows per transaction)", min_value=1,
+                                 value=DEFAULT_BATCH_SIZE, step=100, key="bulk_batch")
+    if upload is not None:
+        try:
+            df = read_upload(upload)
+            valid, errors = validate(df, spec)
+        except ImportError as e:
+            st.error(f"❌ Reading Excel files needs an extra package: {e}")
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            st.write(f"**{len(valid)}** valid rows, **{len(errors)}** rows with errors.")
+            st.dataframe(valid.head(20), use_container_width=True)
+            if len(errors):
+                st.warning("⚠️ These rows will be skipped:")
+                st.dataframe(errors, use_container_width=True)
+            if len(valid) and st.button(f"Import {len(valid)} {kind}"):
+                bar = st.progress(0.0)
+                try:
+                    report = insert_rows(spec, valid, int(batch_size), progress=bar.progress)
+                except Exception as e:
+                    st.error(f"❌ Import stopped: {e}. Batches before the failing one were committed.")
+                else:
+                    st.success(
+                        f"✅ Imported {report['rows']} rows in {report['batches']} batches "
+                        f"({report['seconds']}s, {report['rows_per_sec']} rows/sec)."
+                    )
+
+
+# ---------------- EXPORTS ---------------- #
+def _exports_section():
+    st.subheader("📤 Export Reports")
+    st.caption("Rows are streamed from MySQL in chunks and spooled to disk, so memory stays flat "
+               "for large exports. For very large files use `python exports.py --help`. "
+               f"Prepared files are deleted after {SPOOL_MAX_AGE_SECONDS // 60} minutes.")
+    purge_spool()
+    report = st.selectbox("Report", list(REPORTS), key="exp_report")
+    fmt = st.radio("Format", list(FORMATS), horizontal=True, key="exp_format")
+    company_id, job_id = _company_job_filters(Filters(), "exp")
+    season = st.date_input("Season (date range)", value=(), key="exp_dates")
+    chunk_size = st.number_input("Chunk size (rows)", min_value=100, value=DEFAULT_CHUNK_SIZE,
+                                 step=1000, key="exp_chunk")
+
+    if st.button("Prepare Export"):
+        previous = st.session_state.pop("export_file", None)
+        if previous and os.path.exists(previous["path"]):
+            os.remove(previous["path"])
+        extension, _ = FORMATS[fmt]
+        handle = spool_file(fmt)
+        try:
+            with handle:
+                rows = export(report, fmt, handle, int(chunk_size), company_id=company_id, job_id=job_id,
+                              date_from=season[0] if len(season) == 2 else None,
+                              date_to=season[1] if len(season) == 2 else None)
+        except ImportError:
+            os.remove(handle.name)
+            st.error("❌ Parquet export needs the optional `pyarrow` package.")
+        else:
+            st.session_state.export_file = {"path": handle.name, "rows": rows, "format": fmt,
+                                            "name": f"{report.lower()}.{extension}"}
+
+    ready = st.session_state.get("export_file")
+    if ready and os.path.exists(ready["path"]):
+        st.success(f"✅ {ready['rows']} rows ready ({os.path.getsize(ready['path']) // 1024} KB).")
+        with open(ready["path"], "rb") as f:
+            st.download_button("⬇️ Download", f, ready["name"], FORMATS[ready["format"]][1])
+
+
+# ---------------- PERFORMANCE ---------------- #
+def _performance_section():
+    st.subheader("📈 Query Performance")
+    profiler = get_profiler()
+    summary = profiler.summary()
+    st.caption(f"Statements slower than {profiler.slow_ms} ms are logged with their EXPLAIN plan.")
+
+    c1, c2, c3 = st.columns(3)
+    c1.download_button("⬇️ Export JSON", profiler.to_json(), "query_profile.json", "application/json")
+    c2.download_button("⬇️ Export CSV", profiler.to_csv(), "query_profile.csv", "text/csv")
+    if c3.button("Reset statistics"):
+        profiler.reset()
+        summary = []
+
+    if not summary:
+        st.info("No statements recorded yet.")
+        return
+    st.dataframe([{k: v for k, v in row.items() if k != "histogram"} for row in summary],
+                 use_container_width=True)
+
+    statements = [row["statement"] for row in summary]
+    chosen = st.selectbox("Latency histogram for", statements, key="perf_statement",
+                          format_func=lambda q: q[:120])
+    histogram = next(row["histogram"] for row in summary if row["statement"] == chosen)
+    labels = bucket_labels()
+    st.bar_chart(pd.DataFrame({"calls": [histogram[label] for label in labels]}, index=labels))
+
+    st.markdown("### 🐢 Slow Queries")
+    slow = profiler.slow_queries()
+    if not slow:
+        st.success("No slow queries recorded.")
+    for entry in slow:
+        with st.expander(f"{entry['ms']} ms · {entry['site']} · {entry['at']}"):
+            st.code(entry["statement"], language="sql")
+            if entry["plan"]:
+                st.dataframe(entry["plan"], use_container_width=True)
+
+
+SECTIONS = {
+    "Companies": _companies_section,
+    "Job Postings": _job_postings_section,
+    "Applications": _applications_section,
+    "Interviews": _interviews_section,
+    "Interview Drive": _interview_drive_section,
+    "Students": _students_section,
+    "Bulk Import": _bulk_import_section,
+    "Analytics": show_analytics,
+    "Exports": _exports_section,
+    "Performance": _performance_section,
+}
+
+
+def show_officer_portal(officer):
+    st.header("🧑‍💼 Placement Officer Dashboard")
+    st.markdown(f"**Welcome, {officer.get('Officer_Name', officer.get('Email','Officer'))}**")
+
+    # Only the selected section runs its queries (st.tabs would execute all of them).
+    section = st.radio("Section", list(SECTIONS), horizontal=True,
+                       key="officer_section", label_visibility="collapsed")
+    mark_section(section)
+    with query_tracker() as render:
+        SECTIONS[section]()
+
+    with st.sidebar.expander("⏱ This Render"):
+        st.json(render)
+    with st.sidebar.expander("🔌 DB Connection Pool"):
+        st.json(pool_stats())
+    with st.sidebar.expander("⚡ Query Cache"):
+        st.json(cache_stats())
@@ -1,14 +1,115 @@
 # pages/student_portal.py
+import uuid
+from functools import partial
+
 import streamlit as st
-from db_connection import run_query, run_commit
-from utils import student_is_eligible_for_job
+from db_connection import run_query, gather
+from profiling import mark_section
+from eligibility import eligible_job_ids
+from student_profile import update_profile
+from placement_summary import student_summary
+from job_search import get_search_index
+import applications
+import status_events
+
+# Statements issued on every dashboard render (also replayed by benchmarks/bench_portal.py)
+JOBS_SQL = """
+    SELECT j.Job_ID, j.Job_Title, j.Salary_Package, j.Minimum_CGPA, j.Location, c.Company_Name
+    FROM JOB_POSTING j
+    JOIN COMPANY c ON j.Company_ID = c.Company_ID
+    ORDER BY j.Salary_Package DESC
+"""
+MY_APPLICATIONS_SQL = """
+    SELECT a.Application_ID, j.Job_Title, c.Company_Name,
+           a.Application_Date, a.Application_Status
+    FROM APPLICATION a
+    JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+    JOIN COMPANY c ON j.Company_ID = c.Company_ID
+    WHERE a.Student_ID = %s
+    ORDER BY a.Application_Date DESC
+"""
+MY_INTERVIEWS_SQL = """
+    SELECT i.Interview_ID, j.Job_Title, c.Company_Name,
+           i.Interview_Date, i.Interview_Round, i.Result
+    FROM INTERVIEW i
+    JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+    JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+    JOIN COMPANY c ON j.Company_ID = c.Company_ID
+    WHERE a.Student_ID = %s
+    ORDER BY i.Interview_Date DESC
+"""
+
+APPLY_MESSAGES = {
+    applications.SUBMITTED: ("success", "✅ Application submitted successfully!"),
+    applications.ALREADY_SUBMITTED: ("info", "ℹ️ This application was already submitted."),
+    applications.DUPLICATE: ("warning", "⚠️ You have already applied to this job."),
+    applications.KEY_REUSED: ("error", "❌ This form was already used for another application. Please submit again."),
+    applications.CLOSED: ("error", "❌ The application deadline for this job has passed."),
+    applications.FULL: ("error", "❌ All positions for this job have been filled."),
+    applications.NOT_FOUND: ("error", "❌ Job ID not found."),
+}
+
+
+def _section_call(name, student_id):
+    """Fresh read of one per-student section kept in the session."""
+    if name == "summary":
+        return partial(student_summary, student_id, ttl=0)
+    sql = {"apps": MY_APPLICATIONS_SQL, "interviews": MY_INTERVIEWS_SQL}[name]
+    return partial(run_query, sql, (student_id,), ttl=0)
+
+
+def load_dashboard(student_id):
+    """
+    A session's first render: (jobs, eligible_ids, apps, interviews, summary, inbox).
+    The inbox is read first and the per-student sections fresh after it, so a
+    change committed in between is either already in the sections or found by
+    the next changes_since() of the inbox's cursor. The rest is concurrent.
+    """
+    inbox = status_events.recent_events(student_id)
+    return gather(
+        partial(run_query, JOBS_SQL, ttl=300),
+        # one primary-key range scan instead of evaluating every job in Python
+        partial(eligible_job_ids, student_id),
+        _section_call("apps", student_id),
+        _section_call("interviews", student_id),
+        # one primary-key row maintained on every application/interview change
+        _section_call("summary", student_id),
+    ) + [inbox]
+
+
+def refresh_dashboard(student_id, board):
+    """
+    A later render: the shared reads plus one check for status events after
+    board["cursor"]. Only the sections those events touch are refetched into
+    `board` (usually none). Returns (jobs, eligible_ids, new_events).
+    """
+    jobs, eligible_ids, events = gather(
+        partial(run_query, JOBS_SQL, ttl=300),
+        partial(eligible_job_ids, student_id),
+        partial(status_events.changes_since, student_id, board["cursor"]),
+    )
+    if events:
+        names = sorted(status_events.sections_changed(events))
+        board.update(zip(names, gather(*[_section_call(name, student_id) for name in names])))
+        board["inbox"] = (events[::-1] + board["inbox"])[:status_events.INBOX_SIZE]
+        board["cursor"] = events[-1]["Event_ID"]
+    return jobs, eligible_ids, events
+
+
+def _mark_all_read(student_id):
+    board = st.session_state.dashboard
+    status_events.mark_seen(student_id, board["cursor"])
+    for event in board["inbox"]:
+        event["Seen"] = 1
 
 
 def show_student_portal(student):
     st.header("🎓 Student Dashboard")
     st.markdown(f"**Hello, {student.get('First_Name', 'Student')} (ID: {student.get('Student_ID')})**")
+    inbox_slot = st.container()  # filled once the dashboard data is loaded
 
     # ---------------- PERSONAL INFO ---------------- #
+    mark_section("Profile")
     with st.expander("👤 View / Edit Personal Info", expanded=True):
         fname = st.text_input("First Name", student.get("First_Name", ""))
         lname = st.text_input("Last Name", student.get("Last_Name", ""))
@@ -19,108 +120,167 @@ def show_student_portal(student):
             value=float(student.get("CGPA") or 0.0), 
             min_value=0.0, max_value=10.0, step=0.1
         )
+        branch = st.text_input("Branch", student.get("Branch") or "")
+        backlogs = st.number_input("Active Backlogs", value=int(student.get("Backlogs") or 0), min_value=0)
+        grad_year = st.number_input("Graduation Year", value=int(student.get("Graduation_Year") or 0),
+                                    min_value=0, help="0 = not set")
 
         if st.button("Update Profile"):
-            run_commit("""
-                UPDATE STUDENT
-                SET First_Name=%s, Last_Name=%s, Email=%s, Phone=%s, CGPA=%s
-                WHERE Student_ID=%s
-            """, (fname, lname, email, phone, cgpa, student["Student_ID"]))
-            st.success("✅ Profile updated successfully! Please refresh or re-login to see the latest data.")
+            # the session's cached profile is replaced in place, no re-login needed
+            student = update_profile(student["Student_ID"], fname, lname, email, phone, cgpa,
+                                     branch.strip().upper() or None, backlogs, grad_year or None) or student
+            st.success("✅ Profile updated successfully!")
 
     st.divider()
 
+    # fetched after the profile form so an update is reflected in eligibility
+    mark_section("Dashboard")
+    board = st.session_state.get("dashboard")
+    if board is None or board["student_id"] != student["Student_ID"]:
+        jobs, eligible_ids, apps, interviews, summary, inbox = load_dashboard(student["Student_ID"])
+        # per-student sections survive reruns; status events say when to refetch them
+        board = st.session_state.dashboard = {
+            "student_id": student["Student_ID"], "apps": apps, "interviews": interviews,
+            "summary": summary, "inbox": inbox, "cursor": inbox[0]["Event_ID"] if inbox else 0,
+        }
+        new_events = []
+    else:
+        jobs, eligible_ids, new_events = refresh_dashboard(student["Student_ID"], board)
+    apps, interviews, summary = board["apps"], board["interviews"], board["summary"]
+
+    # ---------------- NOTIFICATIONS ---------------- #
+    mark_section("Inbox")
+    if hasattr(st, "toast"):
+        for event in new_events:
+            st.toast(event["Message"], icon="🔔")
+    unread = sum(1 for e in board["inbox"] if not e["Seen"])
+    with inbox_slot.expander(f"🔔 Notifications ({unread} new)" if unread else "🔔 Notifications",
+                             expanded=bool(unread)):
+        if not board["inbox"]:
+            st.caption("No updates yet. Status changes from the placement office will show up here.")
+        for event in board["inbox"]:
+            st.markdown(f"{'🆕 ' if not event['Seen'] else ''}**{event['Created_At']:%d %b %H:%M}** — "
+                        f"{event['Message']}")
+        if unread:
+            st.button("Mark all as read", key="inbox_seen", on_click=_mark_all_read,
+                      args=(student["Student_ID"],))
+
     # ---------------- JOB POSTINGS ---------------- #
+    mark_section("Job Postings")
     st.subheader("💼 Job Postings (eligible first)")
 
-    jobs = run_query("""
-        SELECT j.Job_ID, j.Job_Title, j.Salary_Package, j.Minimum_CGPA, j.Location, c.Company_Name
-        FROM JOB_POSTING j
-        JOIN COMPANY c ON j.Company_ID = c.Company_ID
-        ORDER BY j.Salary_Package DESC
-    """)
-
-    rows = []
-    for j in jobs:
-        eligible = student_is_eligible_for_job(student.get("CGPA", 0), j)
-        rows.append({
+    index = get_search_index()
+    index.refresh()
+    locations, (low, high) = index.facets()
+    query = st.text_input("🔍 Search jobs", placeholder="title, skill, company or location — typos are fine")
+    col1, col2, col3 = st.columns([2, 2, 1])
+    chosen_locations = col1.multiselect("Location", locations)
+    salary_range = col2.slider("Salary", low, high, (low, high)) if low < high else None
+    eligible_only = col3.checkbox("Eligible only")
+    filtering = query.strip() or chosen_locations or eligible_only or (salary_range and salary_range != (low, high))
+
+    if filtering:
+        results = index.search(query, chosen_locations, salary_range,
+                               job_ids=eligible_ids if eligible_only else None)
+        rows = [{
             "Job_ID": j["Job_ID"],
             "Job_Title": j["Job_Title"],
             "Company": j["Company_Name"],
             "Salary": j.get("Salary_Package"),
             "Min_CGPA": j.get("Minimum_CGPA"),
             "Location": j.get("Location"),
-            "Eligible": "✅ Yes" if eligible else "❌ No"
-        })
-    st.dataframe(rows, use_container_width=True)
+            "Eligible": "✅ Yes" if j["Job_ID"] in eligible_ids else "❌ No",
+            "Score": j["Score"],
+        } for j in results]
+        if not rows:
+            st.info("No job postings match your search.")
+        else:
+            st.dataframe(rows, use_container_width=True)
+        stats = index.last_refresh
+        st.caption(f"Top {len(rows)} of {stats.get('postings', 0)} postings "
+                   f"({stats.get('terms', 0)} indexed terms)")
+    else:
+        rows = []
+        for j in jobs:
+            rows.append({
+                "Job_ID": j["Job_ID"],
+                "Job_Title": j["Job_Title"],
+                "Company": j["Company_Name"],
+                "Salary": j.get("Salary_Package"),
+                "Min_CGPA": j.get("Minimum_CGPA"),
+                "Location": j.get("Location"),
+                "Eligible": "✅ Yes" if j["Job_ID"] in eligible_ids else "❌ No"
+            })
+        rows.sort(key=lambda r: r["Eligible"] != "✅ Yes")  # stable: keeps salary order within each group
+        st.dataframe(rows, use_container_width=True)
 
     st.divider()
 
     # ---------------- APPLY FOR JOB ---------------- #
+    mark_section("Apply")
     st.subheader("📩 Apply for a Job")
     job_id = st.number_input("Job ID to apply", min_value=1)
     cover = st.text_area("Cover Letter (optional)")
+    # one key per intended submission: a resent click/retry cannot create a second row
+    if "apply_key" not in st.session_state:
+        st.session_state.apply_key = uuid.uuid4().hex
     if st.button("Submit Application"):
-        job = run_query("SELECT * FROM JOB_POSTING WHERE Job_ID=%s", (job_id,))
-        if not job:
-            st.error("❌ Job ID not found.")
-        else:
-            job = job[0]
-            if not student_is_eligible_for_job(student.get("CGPA", 0), job):
-                st.warning("⚠️ You do not meet the minimum CGPA. Officer may still review your application.")
-            run_commit("""
-                INSERT INTO APPLICATION (Student_ID, Job_ID, Application_Date, Application_Status, Cover_Letter)
-                VALUES (%s, %s, CURDATE(), %s, %s)
-            """, (student["Student_ID"], job_id, "Under Review", cover))
-            st.success("✅ Application submitted successfully!")
+        outcome = applications.submit_application(student["Student_ID"], job_id, cover,
+                                                  st.session_state.apply_key)
+        # any outcome is final for this key; only an error (no outcome) keeps it for the retry
+        st.session_state.apply_key = uuid.uuid4().hex
+        if outcome == applications.SUBMITTED:
+            # include the new row
+            apps, summary = gather(_section_call("apps", student["Student_ID"]),
+                                   _section_call("summary", student["Student_ID"]))
+            board.update(apps=apps, summary=summary)
+            if job_id not in eligible_ids:
+                st.warning("⚠️ You do not meet this job's eligibility criteria. Officer may still review your application.")
+        level, message = APPLY_MESSAGES[outcome]
+        getattr(st, level)(message)
 
     st.divider()
 
     # ---------------- APPLICATIONS ---------------- #
+    mark_section("Applications")
     st.subheader("🧾 My Applications & Interview Info")
 
-    apps = run_query("""
-        SELECT a.Application_ID, j.Job_Title, c.Company_Name, 
-               a.Application_Date, a.Application_Status
-        FROM APPLICATION a
-        JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
-        JOIN COMPANY c ON j.Company_ID = c.Company_ID
-        WHERE a.Student_ID = %s
-        ORDER BY a.Application_Date DESC
-    """, (student["Student_ID"],))
     st.dataframe(apps, use_container_width=True)
 
     st.divider()
 
     # ---------------- INTERVIEWS ---------------- #
+    mark_section("Interviews")
     st.subheader("🗓️ My Interview Rounds")
 
-    interviews = run_query("""
-        SELECT i.Interview_ID, j.Job_Title, c.Company_Name,
-               i.Interview_Date, i.Interview_Round, i.Result
-        FROM INTERVIEW i
-        JOIN APPLICATION a ON i.Application_ID = a.Application_ID
-        JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
-        JOIN COMPANY c ON j.Company_ID = c.Company_ID
-        WHERE a.Student_ID = %s
-        ORDER BY i.Interview_Date DESC
-    """, (student["Student_ID"],))
-
     if interviews:
         st.dataframe(interviews, use_container_width=True)
+    else:
+        st.info("No interview records found yet.")
 
-        # determine latest interview result safely
-        latest_result = (interviews[0].get("Result") or "").strip().lower()
+    # ---------------- FINAL STATUS ---------------- #
+    if summary and (summary["Applications"] or summary["Current_Status"] != "Pending"):
         st.markdown("---")
         st.markdown("### 📋 Final Status")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Applications", summary["Applications"])
+        c2.metric("Offers", summary["Offers"])
+        if summary["Best_Offer_Job_ID"]:
+            c3.metric("Best Offer", f"{summary['Best_Offer_Salary'] or 0:,.0f}")
+            st.caption(f"Best offer: {summary['Best_Offer_Title']} at {summary['Best_Offer_Company']}")
 
-        if latest_result in ("selected", "passed", "shortlisted", "placed"):
-            st.success("🎉 You have been **shortlisted or placed**! Congratulations!")
-        elif latest_result in ("not placed", "rejected", "failed"):
-            st.error("❌ You were **not selected** in the latest interview round.")
-        elif latest_result in ("pending", "", None):
-            st.info("⏳ Your interview result is still **pending**.")
+        status = summary["Current_Status"]
+        latest_result = (summary["Latest_Result"] or "").strip().lower()
+        if status == "Placed":
+            st.success("🎉 You have been **placed**! Congratulations!")
+        elif status == "Not Placed":
+            st.error("❌ You were **not selected** for any of your applications.")
+        elif summary["Offers"]:
+            st.success("🎉 You have been **selected** — awaiting final placement.")
+        elif latest_result in ("selected", "passed", "shortlisted"):
+            st.success(f"🎉 You have been **shortlisted** in the {summary['Latest_Round'] or 'latest'} round!")
+        elif latest_result in ("rejected", "failed", "not placed"):
+            st.warning(f"⚠️ Not selected in the {summary['Latest_Round'] or 'latest'} round; "
+                       "your other applications are still open.")
         else:
-            st.write(f"🟡 Current status: {interviews[0].get('Result')}")
-    else:
-        st.info("No interview records found yet.")
+            st.info("⏳ Your placement status is still **pending**.")
@@ -0,0 +1,135 @@
+# pagination.py - keyset pagination and filter pushdown for large officer tables
+from functools import partial
+
+import streamlit as st
+
+from db_connection import run_query, gather
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+class Filters:
+    """Accumulates SQL WHERE clauses and their parameters."""
+
+    def __init__(self):
+        self.clauses = []
+        self.params = []
+
+    def add(self, clause, *params):
+        self.clauses.append(clause)
+        self.params.extend(params)
+        return self
+
+    def where(self, extra=None):
+        clauses = self.clauses + ([extra] if extra else [])
+        return (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+
+def _seek(sort_expr, key_expr, op, descending, after):
+    """
+    WHERE clause for the rows after cursor `after`. Sort columns may be NULL and
+    MySQL orders NULLs first ascending and last descending, so the seek places
+    them explicitly (a plain comparison with NULL is never true).
+    """
+    value, key_value = after
+    if value is None:
+        if descending:
+            # NULLs come last: only the remaining NULL rows follow
+            return f"({sort_expr} IS NULL AND {key_expr} {op} %s)", [key_value]
+        # NULLs come first: the remaining NULL rows, then every non-NULL row
+        return f"({sort_expr} IS NOT NULL OR {key_expr} {op} %s)", [key_value]
+    tail = f" OR {sort_expr} IS NULL" if descending else ""
+    return (f"({sort_expr} {op} %s OR ({sort_expr} = %s AND {key_expr} {op} %s){tail})",
+            [value, value, key_value])
+
+
+def fetch_page(from_sql, columns, filters, sort, key, descending=True, after=None, page_size=50):
+    """
+    Fetch one page ordered by `sort` with `key` as the unique tie-breaker.
+    `sort` and `key` are (sql_expression, result_field) pairs and `after`
+    is the (sort_value, key_value) cursor of the previous page's last row.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    sort_expr, sort_field = sort
+    key_expr, key_field = key
+    op = "<" if descending else ">"
+    direction = "DESC" if descending else "ASC"
+    params = list(filters.params)
+    seek = None
+    if after is not None:
+        seek, seek_params = _seek(sort_expr, key_expr, op, descending, after)
+        params += seek_params
+    sql = (
+        f"SELECT {columns} {from_sql}{filters.where(seek)}"
+        f" ORDER BY {sort_expr} {direction}, {key_expr} {direction} LIMIT %s"
+    )
+    # one extra row tells us whether another page exists without a COUNT
+    rows = run_query(sql, tuple(params) + (page_size + 1,))
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        return rows, (last[sort_field], last[key_field])
+    return rows, None
+
+
+def count_rows(from_sql, filters):
+    """Total rows matching the filters (separate, index-only where possible)."""
+    rows = run_query(f"SELECT COUNT(*) AS total {from_sql}{filters.where()}", tuple(filters.params))
+    return rows[0]["total"] if rows else 0
+
+
+def load_page(from_sql, columns, filters, sort, key, descending=True, after=None, page_size=50):
+    """count_rows() and fetch_page() issued concurrently; returns (total, rows, next_cursor)."""
+    total, (rows, next_cursor) = gather(
+        partial(count_rows, from_sql, filters),
+        partial(fetch_page, from_sql, columns, filters, sort, key,
+                descending=descending, after=after, page_size=page_size),
+    )
+    return total, rows, next_cursor
+
+
+def name_filter(filters, term, id_expr, first_expr, last_expr):
+    """Student name search: numeric terms match the ID, text is a prefix match."""
+    term = (term or "").strip()
+    if not term:
+        return
+    if term.isdigit():
+        filters.add(f"{id_expr} = %s", int(term))
+    else:
+        like = term.replace("%", r"\%").replace("_", r"\_") + "%"
+        filters.add(f"({first_expr} LIKE %s OR {last_expr} LIKE %s)", like, like)
+
+
+def show_paginated(key, from_sql, columns, filters, sort_options, key_column):
+    """
+    Render page-size/sort controls, the total count and one page of rows.
+    The stack of page cursors lives in session state and is reset whenever
+    the filters, sort or page size change.
+    """
+    c1, c2, c3 = st.columns([2, 1, 1])
+    sort_label = c1.selectbox("Sort by", list(sort_options), key=f"{key}_sort")
+    descending = c2.selectbox("Order", ["Descending", "Ascending"], key=f"{key}_order") == "Descending"
+    page_size = c3.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+
+    signature = (filters.where(), tuple(map(str, filters.params)), sort_label, descending, page_size)
+    pages_key, sig_key = f"{key}_pages", f"{key}_signature"
+    if st.session_state.get(sig_key) != signature:
+        st.session_state[sig_key] = signature
+        st.session_state[pages_key] = [None]
+    pages = st.session_state[pages_key]
+
+    total, rows, next_cursor = load_page(
+        from_sql, columns, filters, sort_options[sort_label], key_column,
+        descending=descending, after=pages[-1], page_size=page_size,
+    )
+    st.dataframe(rows, use_container_width=True)
+
+    page_no = len(pages)
+    last_page = max(1, -(-total // page_size))
+    n1, n2, n3 = st.columns([1, 2, 1])
+    n1.button("◀ Previous", key=f"{key}_prev", disabled=page_no == 1,
+              on_click=pages.pop)
+    n2.caption(f"Page {page_no} of {last_page} · {total} matching rows")
+    n3.button("Next ▶", key=f"{key}_next", disabled=next_cursor is None,
+              on_click=pages.append, args=(next_cursor,))
+    return rows
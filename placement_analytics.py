@@ -0,0 +1,216 @@
+# placement_analytics.py - incremental, vectorized placement statistics
+import datetime
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from db_connection import run_query
+
+# Analytics settings
+#   settle_seconds - how long a write may take to commit; rows stamped within
+#                    this window of the database clock are re-read next refresh
+ANALYTICS_CONFIG = {
+    "settle_seconds": 5,
+}
+
+SELECTED = ["Selected", "Placed"]
+REJECTED = ["Rejected", "Not Selected", "Not Placed"]
+SHORTLISTED = ["Shortlisted", "Interview Scheduled"] + SELECTED
+CGPA_BANDS = [0, 6, 7, 8, 9, 10.01]
+CGPA_LABELS = ["< 6", "6 - 7", "7 - 8", "8 - 9", "9 - 10"]
+
+APPLICATION_COLUMNS = ["Application_ID", "Student_ID", "Job_ID", "Application_Date",
+                       "Application_Status", "Updated_At"]
+INTERVIEW_COLUMNS = ["Interview_ID", "Application_ID", "Interview_Round", "Interview_Date",
+                     "Result", "Updated_At"]
+
+
+def _frame(rows, columns):
+    return pd.DataFrame.from_records(rows, columns=columns)
+
+
+def _changed_rows(old, new, key):
+    """How many rows of `new` are not already in `old` with identical values."""
+    if new.empty:
+        return 0
+    existing = old[old[key].isin(new[key])]
+    if existing.empty:
+        return len(new)
+    try:
+        merged = new.merge(existing, on=list(new.columns), how="left", indicator=True)
+    except ValueError:  # column dtypes drifted (e.g. an all-NULL batch); treat as changed
+        return len(new)
+    return int((merged["_merge"] == "left_only").sum())
+
+
+def _sweep(frame, table, key, expected):
+    """
+    Deletions leave no Updated_At behind: when the row count differs from the
+    table's, drop the rows whose key is gone. Returns (frame, rows removed).
+    """
+    if len(frame) == expected:
+        return frame, 0
+    live = {r[key] for r in run_query(f"SELECT {key} FROM {table}", ttl=0)}
+    kept = frame[frame[key].isin(live)].reset_index(drop=True)
+    return kept, len(frame) - len(kept)
+
+
+def _upsert(old, new, key):
+    """Replace rows of `old` whose key appears in `new`, append the rest."""
+    if new.empty:
+        return old
+    if old.empty:
+        return new.reset_index(drop=True)
+    return pd.concat([old[~old[key].isin(new[key])], new], ignore_index=True)
+
+
+class AnalyticsStore:
+    """
+    Columnar copy of APPLICATION and INTERVIEW kept in memory and topped up
+    with only the rows whose Updated_At moved past the last watermark; a row
+    count mismatch triggers an ID sweep for deleted rows.
+    Aggregates are recomputed (vectorized) only when something changed.
+    """
+
+    def __init__(self):
+        self.applications = _frame([], APPLICATION_COLUMNS)
+        self.interviews = _frame([], INTERVIEW_COLUMNS)
+        self.watermark = None
+        self.results = None
+        self.refreshed_at = None
+        self.last_refresh = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Pull rows touched since the watermark; returns how many actually changed."""
+        with self._lock:
+            start = time.perf_counter()
+            # read before the rows so the new watermark never runs ahead of what was read
+            head = run_query("""
+                SELECT NOW() AS now, (SELECT COUNT(*) FROM APPLICATION) AS applications,
+                       (SELECT COUNT(*) FROM INTERVIEW) AS interviews
+            """, ttl=0)[0]
+            now = head["now"]
+            where, params = ("", ()) if self.watermark is None else ("WHERE Updated_At > %s", (self.watermark,))
+            apps = _frame(run_query(
+                f"SELECT {', '.join(APPLICATION_COLUMNS)} FROM APPLICATION {where}", params, ttl=0
+            ), APPLICATION_COLUMNS)
+            ints = _frame(run_query(
+                f"SELECT {', '.join(INTERVIEW_COLUMNS)} FROM INTERVIEW {where}", params, ttl=0
+            ), INTERVIEW_COLUMNS)
+            # dimension tables are small and served from the shared query cache
+            students = _frame(run_query("SELECT Student_ID, CGPA, Branch FROM STUDENT"),
+                              ["Student_ID", "CGPA", "Branch"])
+            jobs = _frame(run_query("""
+                SELECT j.Job_ID, j.Company_ID, c.Company_Name, j.Salary_Package
+                FROM JOB_POSTING j JOIN COMPANY c ON j.Company_ID = c.Company_ID
+            """), ["Job_ID", "Company_ID", "Company_Name", "Salary_Package"])
+
+            changed = (_changed_rows(self.applications, apps, "Application_ID")
+                       + _changed_rows(self.interviews, ints, "Interview_ID"))
+            self.applications = _upsert(self.applications, apps, "Application_ID")
+            self.interviews = _upsert(self.interviews, ints, "Interview_ID")
+            self.applications, removed_apps = _sweep(self.applications, "APPLICATION", "Application_ID",
+                                                     head["applications"])
+            self.interviews, removed_ints = _sweep(self.interviews, "INTERVIEW", "Interview_ID",
+                                                   head["interviews"])
+            changed += removed_apps + removed_ints
+            # Rows stamped in the last few seconds may belong to transactions that had not
+            # committed yet (a long record_results), so the watermark trails the database
+            # clock rather than the newest stamp; re-read unchanged rows are not counted.
+            settled = now - datetime.timedelta(seconds=ANALYTICS_CONFIG["settle_seconds"])
+            self.watermark = max(settled, self.watermark) if self.watermark else settled
+
+            dims = (len(students), len(jobs), int(pd.util.hash_pandas_object(students).sum()),
+                    int(pd.util.hash_pandas_object(jobs).sum()))
+            if changed or self.results is None or dims != self.last_refresh.get("dims"):
+                self.results = compute_stats(self.applications, self.interviews, students, jobs)
+            self.refreshed_at = time.strftime("%H:%M:%S")
+            self.last_refresh = {
+                "rows_fetched": len(apps) + len(ints),
+                "rows_changed": changed,
+                "applications": len(self.applications),
+                "interviews": len(self.interviews),
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+                "dims": dims,
+            }
+            return changed
+
+
+def compute_stats(applications, interviews, students, jobs):
+    """
+    All dashboard aggregates from the raw frames, using groupby/merge only.
+    Offers and rejections follow the final Application_Status (an interview
+    Selected can still end in an HR rejection); interviews only feed the
+    shortlisted/interviewed funnel stages.
+    """
+    per_app = interviews.groupby("Application_ID").agg(interviews=("Interview_ID", "size"))
+    apps = (
+        applications[["Application_ID", "Student_ID", "Job_ID", "Application_Status"]]
+        .merge(per_app, left_on="Application_ID", right_index=True, how="left")
+        .merge(jobs, on="Job_ID", how="left")
+        .merge(students, on="Student_ID", how="left")
+    )
+    apps["interviews"] = apps["interviews"].fillna(0)
+    apps["interviewed"] = apps["interviews"] > 0
+    apps["selected"] = apps["Application_Status"].isin(SELECTED)
+    apps["shortlisted"] = apps["selected"] | apps["interviewed"] | apps["Application_Status"].isin(SHORTLISTED)
+    apps["rejected"] = apps["Application_Status"].isin(REJECTED)
+
+    funnel = pd.DataFrame({
+        "Stage": ["Applied", "Shortlisted", "Interviewed", "Selected"],
+        "Applications": [len(apps), int(apps["shortlisted"].sum()),
+                         int(apps["interviewed"].sum()), int(apps["selected"].sum())],
+    })
+    funnel["% of applied"] = (funnel["Applications"] / max(len(apps), 1) * 100).round(1)
+
+    by_company = apps.groupby("Company_Name").agg(
+        Applications=("Application_ID", "size"),
+        Applicants=("Student_ID", "nunique"),
+        Interviewed=("interviewed", "sum"),
+        Offers=("selected", "sum"),
+    )
+    placed_students = apps[apps["selected"]].groupby("Company_Name")["Student_ID"].nunique()
+    by_company["Students_Placed"] = placed_students.reindex(by_company.index, fill_value=0)
+    by_company["Placement_Rate_%"] = (by_company["Students_Placed"] / by_company["Applicants"] * 100).round(1)
+    by_company = by_company.sort_values("Placement_Rate_%", ascending=False).reset_index()
+
+    offers = pd.to_numeric(apps.loc[apps["selected"], "Salary_Package"], errors="coerce").dropna()
+    quantiles = [0.1, 0.25, 0.5, 0.75, 0.9]
+    salary = pd.DataFrame({
+        "Statistic": ["Offers", "Mean"] + [f"P{int(q * 100)}" for q in quantiles] + ["Max"],
+        "Salary": [len(offers), offers.mean()] + list(offers.quantile(quantiles)) + [offers.max()],
+    }) if len(offers) else pd.DataFrame({"Statistic": ["Offers"], "Salary": [0]})
+
+    apps["CGPA_Band"] = pd.cut(pd.to_numeric(apps["CGPA"], errors="coerce"), CGPA_BANDS,
+                               labels=CGPA_LABELS, right=False)
+    apps["Outcome"] = "In progress"
+    apps.loc[apps["rejected"], "Outcome"] = "Rejected"
+    apps.loc[apps["selected"], "Outcome"] = "Selected"
+    cgpa = pd.crosstab(apps["CGPA_Band"], apps["Outcome"]).reindex(CGPA_LABELS, fill_value=0)
+    totals = cgpa.sum(axis=1)
+    if "Selected" in cgpa:
+        cgpa["Selection_Rate_%"] = (cgpa["Selected"] / totals.where(totals > 0) * 100).round(1)
+
+    student_outcome = apps.groupby("Student_ID")["selected"].any()
+    overall = {
+        "Students applied": int(student_outcome.size),
+        "Students placed": int(student_outcome.sum()),
+        "Placement rate %": round(float(student_outcome.mean() * 100), 1) if student_outcome.size else 0.0,
+        "Offers": int(apps["selected"].sum()),
+    }
+    return {
+        "overall": overall,
+        "funnel": funnel,
+        "by_company": by_company,
+        "salary": salary,
+        "cgpa": cgpa.reset_index(),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_analytics_store():
+    """Shared by every officer session so the base frames are loaded once per process."""
+    return AnalyticsStore()
@@ -0,0 +1,176 @@
+# placement_summary.py - materialized per-student placement summary (PLACEMENT_SUMMARY table)
+from db_connection import run_query
+from eligibility import refresh_students as refresh_eligibility
+from student_profile import BUMP_VERSION
+
+PLACEMENT_STATUSES = ["Placed", "Not Placed", "Pending"]
+OFFER_STATUSES = ("Selected", "Placed")
+# application statuses that end an application without an offer
+CLOSED_STATUSES = ("Rejected", "Not Selected", "Not Placed")
+
+SUMMARY_COLUMNS = ("Student_ID", "Current_Status", "Applications", "Offers", "Best_Offer_Job_ID",
+                   "Best_Offer_Salary", "Latest_Interview_ID", "Latest_Round", "Latest_Result",
+                   "Latest_Interview_Date")
+
+
+def _literals(values):
+    """Constant statuses inlined as SQL string literals."""
+    return ", ".join(f"'{v}'" for v in values)
+
+
+# One row per student matching {where} (a condition on STUDENT s). Every
+# subquery is a lookup on an APPLICATION/INTERVIEW index for one student.
+# Students without applications keep the status an officer or import gave them.
+SUMMARY_SQL = f"""
+    SELECT x.Student_ID,
+           CASE WHEN x.Placed > 0 THEN 'Placed'
+                WHEN x.Applications > 0 AND x.Open_Applications = 0 THEN 'Not Placed'
+                WHEN x.Applications > 0 THEN 'Pending'
+                ELSE COALESCE(x.Placement_Status, 'Pending')
+           END,
+           x.Applications, x.Offers, x.Best_Offer_Job_ID, j.Salary_Package,
+           i.Interview_ID, i.Interview_Round, i.Result, i.Interview_Date
+    FROM (
+        SELECT s.Student_ID, s.Placement_Status,
+               (SELECT COUNT(*) FROM APPLICATION a
+                WHERE a.Student_ID = s.Student_ID) AS Applications,
+               (SELECT COUNT(*) FROM APPLICATION a
+                WHERE a.Student_ID = s.Student_ID
+                  AND a.Application_Status NOT IN ({_literals(CLOSED_STATUSES)})) AS Open_Applications,
+               (SELECT COUNT(*) FROM APPLICATION a
+                WHERE a.Student_ID = s.Student_ID AND a.Application_Status = 'Placed') AS Placed,
+               (SELECT COUNT(*) FROM APPLICATION a
+                WHERE a.Student_ID = s.Student_ID
+                  AND a.Application_Status IN ({_literals(OFFER_STATUSES)})) AS Offers,
+               (SELECT a.Job_ID FROM APPLICATION a JOIN JOB_POSTING jp ON a.Job_ID = jp.Job_ID
+                WHERE a.Student_ID = s.Student_ID AND a.Application_Status IN ({_literals(OFFER_STATUSES)})
+                ORDER BY jp.Salary_Package DESC, a.Application_ID
+                LIMIT 1) AS Best_Offer_Job_ID,
+               (SELECT li.Interview_ID FROM INTERVIEW li
+                JOIN APPLICATION a ON li.Application_ID = a.Application_ID
+                WHERE a.Student_ID = s.Student_ID
+                ORDER BY li.Interview_Date DESC, li.Interview_ID DESC
+                LIMIT 1) AS Latest_Interview_ID
+        FROM STUDENT s
+        WHERE {{where}}
+    ) x
+    LEFT JOIN JOB_POSTING j ON j.Job_ID = x.Best_Offer_Job_ID
+    LEFT JOIN INTERVIEW i ON i.Interview_ID = x.Latest_Interview_ID
+"""
+
+UPSERT_SQL = "INSERT INTO PLACEMENT_SUMMARY ({}) {{select}} ON DUPLICATE KEY UPDATE {}".format(
+    ", ".join(SUMMARY_COLUMNS),
+    ", ".join(f"{c}=VALUES({c})" for c in SUMMARY_COLUMNS[1:]),
+)
+
+# Read by both portals: one primary-key row plus the best offer's job
+STUDENT_SUMMARY_SQL = """
+    SELECT p.*, j.Job_Title AS Best_Offer_Title, c.Company_Name AS Best_Offer_Company
+    FROM PLACEMENT_SUMMARY p
+    LEFT JOIN JOB_POSTING j ON j.Job_ID = p.Best_Offer_Job_ID
+    LEFT JOIN COMPANY c ON j.Company_ID = c.Company_ID
+    WHERE p.Student_ID = %s
+"""
+
+
+# Lock ordering: every transaction that writes a student's APPLICATION or INTERVIEW
+# rows and refreshes the summary locks the STUDENT rows first (in Student_ID order),
+# before its first write. The INSERT ... SELECT below takes shared locks on those
+# application/interview rows, so two writers that locked the student after their own
+# writes could wait on each other (1213); locked first, they simply queue.
+def lock_students(tx, student_ids):
+    """Lock these STUDENT rows for the rest of transaction `tx`."""
+    ids = sorted(set(student_ids))
+    if ids:
+        tx.query(f"SELECT Student_ID FROM STUDENT WHERE Student_ID IN ({', '.join(['%s'] * len(ids))}) "
+                 f"ORDER BY Student_ID FOR UPDATE", tuple(ids))
+    return ids
+
+
+def lock_applications(tx, application_ids):
+    """Lock the students owning these applications; returns their ids."""
+    ids = list(application_ids)
+    if not ids:
+        return []
+    # plain read: an application never changes owner
+    rows = tx.query(f"SELECT DISTINCT Student_ID FROM APPLICATION "
+                    f"WHERE Application_ID IN ({', '.join(['%s'] * len(ids))})", tuple(ids))
+    return lock_students(tx, [r["Student_ID"] for r in rows])
+
+
+def lock_interviews(tx, interview_ids):
+    """Lock the students owning these interviews; returns their ids."""
+    ids = list(interview_ids)
+    if not ids:
+        return []
+    rows = tx.query(f"""
+        SELECT DISTINCT a.Student_ID FROM INTERVIEW i
+        JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+        WHERE i.Interview_ID IN ({', '.join(['%s'] * len(ids))})
+    """, tuple(ids))
+    return lock_students(tx, [r["Student_ID"] for r in rows])
+
+
+def _refresh(tx, where, params=()):
+    # Callers writing applications/interviews already hold these locks (see above);
+    # for the others (imports, rebuilds) this takes them before the STUDENT update.
+    tx.query(f"SELECT s.Student_ID FROM STUDENT s WHERE {where} ORDER BY s.Student_ID FOR UPDATE", params)
+    tx.execute(UPSERT_SQL.format(select=SUMMARY_SQL.format(where=where)), params)
+    # STUDENT.Placement_Status follows the summary; eligibility depends on it
+    changed = [r["Student_ID"] for r in tx.query(f"""
+        SELECT s.Student_ID FROM STUDENT s
+        JOIN PLACEMENT_SUMMARY p ON p.Student_ID = s.Student_ID
+        WHERE {where} AND NOT (s.Placement_Status <=> p.Current_Status)
+    """, params)]
+    if changed:
+        ids = ", ".join(["%s"] * len(changed))
+        tx.execute(f"""
+            UPDATE STUDENT s JOIN PLACEMENT_SUMMARY p ON p.Student_ID = s.Student_ID
+            SET s.Placement_Status = p.Current_Status, {BUMP_VERSION}
+            WHERE s.Student_ID IN ({ids})
+        """, tuple(changed))
+        refresh_eligibility(tx, changed)
+    return changed
+
+
+def refresh_students(tx, student_ids):
+    """Recompute the summary rows of these students inside transaction `tx`."""
+    ids = sorted(set(student_ids))
+    if ids:
+        _refresh(tx, f"s.Student_ID IN ({', '.join(['%s'] * len(ids))})", tuple(ids))
+
+
+def refresh_students_from(tx, first_id):
+    """Recompute for every student with Student_ID >= first_id (after a bulk insert)."""
+    _refresh(tx, "s.Student_ID >= %s", (first_id,))
+
+
+def refresh_applications(tx, application_ids):
+    """Recompute the summaries of the students owning these applications."""
+    ids = list(application_ids)
+    if ids:
+        rows = tx.query(f"SELECT DISTINCT Student_ID FROM APPLICATION "
+                        f"WHERE Application_ID IN ({', '.join(['%s'] * len(ids))})", tuple(ids))
+        refresh_students(tx, [r["Student_ID"] for r in rows])
+
+
+def refresh_interviews(tx, interview_ids):
+    """Recompute the summaries of the students owning these interviews."""
+    ids = list(interview_ids)
+    if ids:
+        rows = tx.query(f"""
+            SELECT DISTINCT a.Student_ID FROM INTERVIEW i
+            JOIN APPLICATION a ON i.Application_ID = a.Application_ID
+            WHERE i.Interview_ID IN ({', '.join(['%s'] * len(ids))})
+        """, tuple(ids))
+        refresh_students(tx, [r["Student_ID"] for r in rows])
+
+
+def rebuild(tx):
+    """Recompute every student's summary."""
+    return _refresh(tx, "1=1")
+
+
+def student_summary(student_id, ttl=None):
+    rows = run_query(STUDENT_SUMMARY_SQL, (student_id,), ttl=ttl)
+    return rows[0] if rows else None
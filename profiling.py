@@ -0,0 +1,235 @@
+# profiling.py - per-statement latency histograms, slow-query log and exports
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+from query_cache import normalize_sql
+
+# Profiling settings
+#   enabled        - record every run_query/run_commit/transaction statement
+#   slow_ms        - statements slower than this are logged with their EXPLAIN plan
+#   max_slow       - how many slow-query samples to keep
+#   explain_every  - seconds before the same statement is EXPLAINed again
+PROFILING_CONFIG = {
+    "enabled": True,
+    "slow_ms": 200,
+    "max_slow": 100,
+    "explain_every": 60,
+}
+
+# upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+_local = threading.local()
+_INTERNAL_FILES = {"db_connection.py", "profiling.py", "query_cache.py", "pagination.py", "contextlib.py"}
+
+
+@contextmanager
+def call_site(page, section="main"):
+    """Label statements issued inside the block with a page + section."""
+    previous = (getattr(_local, "page", None), getattr(_local, "site", None))
+    _local.page = page
+    _local.site = f"{page} / {section}"
+    try:
+        yield
+    finally:
+        _local.page, _local.site = previous
+
+
+def mark_section(section):
+    """Switch the section label within the enclosing call_site() page."""
+    page = getattr(_local, "page", None)
+    if page:
+        _local.site = f"{page} / {section}"
+
+
+def capture_site():
+    """Snapshot of this thread's call-site labels, for handing work to another thread."""
+    page = getattr(_local, "page", None)
+    return page, getattr(_local, "site", None) or current_site()
+
+
+@contextmanager
+def restore_site(state):
+    """Apply a capture_site() snapshot for the duration of the block (e.g. in a worker thread)."""
+    previous = (getattr(_local, "page", None), getattr(_local, "site", None))
+    _local.page, _local.site = state
+    try:
+        yield
+    finally:
+        _local.page, _local.site = previous
+
+
+def current_site():
+    """The active call_site() label, else the first caller outside the data layer."""
+    site = getattr(_local, "site", None)
+    if site:
+        return site
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename not in _INTERNAL_FILES:
+            return f"{filename[:-3]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class Profiler:
+    """Thread-safe aggregate of statement timings, keyed by normalized SQL."""
+
+    def __init__(self, slow_ms=200, max_slow=100, explain_every=60, enabled=True):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.explain_every = explain_every
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._slow = deque(maxlen=max_slow)
+        self._explained = {}   # statement -> last EXPLAIN time
+        self.started_at = time.time()
+
+    def record(self, query, elapsed_ms, rows=0, acquire_ms=0.0, site=None, kind="read"):
+        if not self.enabled:
+            return
+        statement = normalize_sql(query)
+        site = site or current_site()
+        with self._lock:
+            entry = self._stats.get(statement)
+            if entry is None:
+                entry = self._stats[statement] = {
+                    "statement": statement,
+                    "kind": kind,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "min_ms": None,
+                    "rows": 0,
+                    "acquire_ms": 0.0,
+                    "slow": 0,
+                    "histogram": [0] * (len(BUCKETS_MS) + 1),
+                    "sites": {},
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["min_ms"] = elapsed_ms if entry["min_ms"] is None else min(entry["min_ms"], elapsed_ms)
+            entry["rows"] += rows or 0
+            entry["acquire_ms"] += acquire_ms
+            bucket = next((i for i, bound in enumerate(BUCKETS_MS) if elapsed_ms <= bound), len(BUCKETS_MS))
+            entry["histogram"][bucket] += 1
+            entry["sites"][site] = entry["sites"].get(site, 0) + 1
+            if elapsed_ms >= self.slow_ms:
+                entry["slow"] += 1
+
+    def is_slow(self, elapsed_ms):
+        return self.enabled and elapsed_ms >= self.slow_ms
+
+    def wants_explain(self, query):
+        """True at most once per `explain_every` seconds for a given statement."""
+        statement = normalize_sql(query)
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(statement)
+            if last is not None and now - last < self.explain_every:
+                return False
+            self._explained[statement] = now
+            return True
+
+    def record_slow(self, query, elapsed_ms, rows, site=None, plan=None):
+        with self._lock:
+            self._slow.append({
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "statement": normalize_sql(query),
+                "ms": round(elapsed_ms, 2),
+                "rows": rows,
+                "site": site or current_site(),
+                "plan": plan,
+            })
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self._explained.clear()
+            self.started_at = time.time()
+
+    def summary(self):
+        """One row per statement, slowest total time first."""
+        with self._lock:
+            entries = [dict(e, sites=dict(e["sites"]), histogram=list(e["histogram"]))
+                       for e in self._stats.values()]
+        rows = []
+        for e in entries:
+            calls = e["calls"]
+            rows.append({
+                "statement": e["statement"],
+                "kind": e["kind"],
+                "calls": calls,
+                "total_ms": round(e["total_ms"], 2),
+                "avg_ms": round(e["total_ms"] / calls, 2),
+                "p95_ms": _percentile_from_histogram(e["histogram"], 0.95),
+                "min_ms": round(e["min_ms"], 2),
+                "max_ms": round(e["max_ms"], 2),
+                "avg_rows": round(e["rows"] / calls, 1),
+                "avg_acquire_ms": round(e["acquire_ms"] / calls, 2),
+                "slow": e["slow"],
+                "sites": ", ".join(f"{s} ({n})" for s, n in sorted(e["sites"].items(), key=lambda x: -x[1])),
+                "histogram": dict(zip(bucket_labels(), e["histogram"])),
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def to_json(self):
+        return json.dumps({
+            "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "slow_ms": self.slow_ms,
+            "buckets_ms": BUCKETS_MS,
+            "statements": self.summary(),
+            "slow_queries": self.slow_queries(),
+        }, indent=2, default=str)
+
+    def to_csv(self):
+        rows = self.summary()
+        out = io.StringIO()
+        labels = bucket_labels()
+        fields = [k for k in (rows[0] if rows else {"statement": ""}) if k != "histogram"]
+        writer = csv.writer(out)
+        writer.writerow(fields + [f"hist {label}" for label in labels])
+        for r in rows:
+            writer.writerow([r[k] for k in fields] + [r["histogram"][label] for label in labels])
+        return out.getvalue()
+
+
+def bucket_labels():
+    return [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+
+
+def _percentile_from_histogram(histogram, q):
+    """Upper bound of the bucket holding the q-th percentile (None for the open bucket)."""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = q * total
+    seen = 0
+    for i, count in enumerate(histogram):
+        seen += count
+        if seen >= target:
+            return BUCKETS_MS[i] if i < len(BUCKETS_MS) else None
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def get_profiler():
+    """Process-wide profiler shared by every session."""
+    return Profiler(**PROFILING_CONFIG)
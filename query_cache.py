@@ -0,0 +1,122 @@
+# query_cache.py - shared TTL/LRU cache for SELECT results with per-table invalidation
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+(?:\w+\s+)?FROM)\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+_DDL = re.compile(r"^\s*(?:ALTER|CREATE|DROP|TRUNCATE|RENAME)\b", re.IGNORECASE)
+
+
+def normalize_sql(query):
+    """Collapse whitespace so formatting differences share one cache entry."""
+    return " ".join(query.split())
+
+
+def tables_read(query):
+    return frozenset(t.upper() for t in _READ_TABLES.findall(query))
+
+
+def tables_written(query):
+    """
+    Tables a statement modifies. DDL returns None, meaning "could affect
+    anything" - callers should drop the whole cache.
+    """
+    if _DDL.match(query):
+        return None
+    match = _WRITE_TABLE.match(query)
+    return frozenset([match.group(1).upper()]) if match else frozenset()
+
+
+class QueryCache:
+    """
+    Bounded LRU of query results keyed by normalized SQL + params.
+    Each entry remembers the tables it read; a write to any of those
+    tables evicts it. Per-table generation counters stop a read that
+    raced with a write from storing a result that is already stale.
+    """
+
+    def __init__(self, max_entries=512, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()   # key -> (expires_at, tables, rows)
+        self._by_table = {}             # table -> set of keys
+        self._generation = {}           # table -> int
+        self._epoch = 0                 # bumped when everything is invalidated
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+    @staticmethod
+    def make_key(query, params):
+        return normalize_sql(query), tuple(params or ())
+
+    def get(self, key):
+        """Return cached rows or None; counts the hit/miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[2]
+                self._drop(key)
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+
+    def _generations(self, tables):
+        return self._epoch, tuple(self._generation.get(t, 0) for t in sorted(tables))
+
+    def generations(self, tables):
+        with self._lock:
+            return self._generations(tables)
+
+    def put(self, key, tables, rows, ttl, seen_generations):
+        with self._lock:
+            if self._generations(tables) != seen_generations:
+                return  # a write landed while we were reading
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, tables, rows)
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self._stats["evicted"] += 1
+
+    def invalidate(self, tables=None):
+        """Evict entries that read any of `tables` (all entries if None)."""
+        with self._lock:
+            if tables is None:
+                self._epoch += 1
+                self._stats["invalidated"] += len(self._entries)
+                self._entries.clear()
+                self._by_table.clear()
+                return
+            for table in tables:
+                self._generation[table] = self._generation.get(table, 0) + 1
+                for key in self._by_table.pop(table, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self._stats["invalidated"] += 1
+
+    def _drop(self, key):
+        # caller must hold self._lock
+        _, tables, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys:
+                keys.discard(key)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
@@ -0,0 +1,103 @@
+# status_events.py - per-student log of status changes (STATUS_EVENT) for the student inbox
+from db_connection import run_query, run_commit
+
+# event kinds
+APPLICATION = "application"
+INTERVIEW_SCHEDULED = "interview_scheduled"
+INTERVIEW_RESULT = "interview_result"
+PLACEMENT = "placement"
+
+# student dashboard sections each kind of event can change
+SECTIONS = {
+    APPLICATION: {"apps", "summary"},
+    INTERVIEW_SCHEDULED: {"apps", "interviews", "summary"},
+    INTERVIEW_RESULT: {"apps", "interviews", "summary"},
+    PLACEMENT: {"apps", "interviews", "summary"},
+}
+
+INBOX_SIZE = 20
+CHUNK = 500  # ids per IN (...) list
+
+_JOB = "COALESCE(j.Job_Title, 'a job'), ' at ', COALESCE(c.Company_Name, 'a company')"
+_ROUND = "COALESCE(NULLIF(i.Interview_Round, ''), 'Interview')"
+_MESSAGES = {
+    APPLICATION: f"CONCAT('Application for ', {_JOB}, ' is now ', COALESCE(a.Application_Status, 'updated'))",
+    INTERVIEW_SCHEDULED: f"CONCAT({_ROUND}, ' interview for ', {_JOB}, ' on ', COALESCE(CAST(i.Interview_Date AS CHAR), 'a date to be announced'))",
+    INTERVIEW_RESULT: f"CONCAT({_ROUND}, ' result for ', {_JOB}, ': ', COALESCE(i.Result, 'Pending'))",
+    PLACEMENT: f"CONCAT('Placement result for ', {_JOB}, ': ', COALESCE(i.Result, 'Pending'))",
+}
+
+_EVENT_COLUMNS = "Event_ID, Kind, Application_ID, Interview_ID, Message, Seen, Created_At"
+
+
+def _in(values):
+    return ", ".join(["%s"] * len(values))
+
+
+def _record(tx, kind, id_column, ids):
+    """One event per row of `id_column` IN ids, worded from the rows as they are now in `tx`."""
+    interview = id_column.startswith("i.")
+    ids = list(ids)
+    for start in range(0, len(ids), CHUNK):
+        chunk = tuple(ids[start:start + CHUNK])
+        tx.execute(f"""
+            INSERT INTO STATUS_EVENT (Student_ID, Kind, Application_ID, Interview_ID, Message)
+            SELECT a.Student_ID, %s, a.Application_ID, {'i.Interview_ID' if interview else 'NULL'},
+                   {_MESSAGES[kind]}
+            FROM {'INTERVIEW i JOIN APPLICATION a ON i.Application_ID = a.Application_ID' if interview else 'APPLICATION a'}
+            JOIN JOB_POSTING j ON a.Job_ID = j.Job_ID
+            JOIN COMPANY c ON j.Company_ID = c.Company_ID
+            WHERE {id_column} IN ({_in(chunk)})
+        """, (kind,) + chunk)
+
+
+# Writers: call inside the transaction that made the change, after
+# placement_summary's refresh (which locks the students' rows), so each
+# student's events commit in Event_ID order and a cursor never skips one.
+def application_status(tx, application_ids):
+    _record(tx, APPLICATION, "a.Application_ID", application_ids)
+
+
+def interviews_scheduled(tx, interview_ids):
+    _record(tx, INTERVIEW_SCHEDULED, "i.Interview_ID", interview_ids)
+
+
+def interview_results(tx, interview_ids):
+    _record(tx, INTERVIEW_RESULT, "i.Interview_ID", interview_ids)
+
+
+def placement_results(tx, interview_ids):
+    _record(tx, PLACEMENT, "i.Interview_ID", interview_ids)
+
+
+# Readers
+def recent_events(student_id, limit=INBOX_SIZE):
+    """The student's latest events, newest first."""
+    return run_query(f"""
+        SELECT {_EVENT_COLUMNS} FROM STATUS_EVENT
+        WHERE Student_ID = %s
+        ORDER BY Event_ID DESC
+        LIMIT %s
+    """, (student_id, limit), ttl=0)
+
+
+def changes_since(student_id, event_id):
+    """Events after `event_id`, oldest first: one range scan of (Student_ID, Event_ID), usually empty."""
+    return run_query(f"""
+        SELECT {_EVENT_COLUMNS} FROM STATUS_EVENT
+        WHERE Student_ID = %s AND Event_ID > %s
+        ORDER BY Event_ID
+    """, (student_id, event_id), ttl=0)
+
+
+def sections_changed(events):
+    sections = set()
+    for event in events:
+        sections |= SECTIONS.get(event["Kind"], set())
+    return sections
+
+
+def mark_seen(student_id, up_to):
+    """Mark the student's events up to `up_to` as read."""
+    run_commit("UPDATE STATUS_EVENT SET Seen = 1 WHERE Student_ID = %s AND Event_ID <= %s AND Seen = 0",
+               (student_id, up_to))
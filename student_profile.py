@@ -0,0 +1,62 @@
+# student_profile.py - per-session student profile cache revalidated by Profile_Version
+import time
+
+import streamlit as st
+
+from db_connection import run_query, transaction
+from eligibility import refresh_students
+
+# Profile cache settings
+#   recheck_seconds - a cached profile checked this recently is used as-is;
+#                     after that one primary-key version lookup revalidates it
+PROFILE_CONFIG = {
+    "recheck_seconds": 5,
+}
+
+_CHECKED_AT = "profile_checked_at"
+
+# every UPDATE of a STUDENT row must bump this so open sessions notice
+BUMP_VERSION = "Profile_Version = Profile_Version + 1"
+
+
+def remember(profile):
+    """Cache a freshly read STUDENT row as this session's profile."""
+    st.session_state.user = profile
+    st.session_state[_CHECKED_AT] = time.monotonic()
+    return profile
+
+
+def current_profile():
+    """
+    The session's STUDENT row, re-read only when its Profile_Version moved
+    (e.g. an officer changed the placement status). Returns None if the
+    student no longer exists.
+    """
+    profile = st.session_state.user
+    if time.monotonic() - st.session_state.get(_CHECKED_AT, 0) < PROFILE_CONFIG["recheck_seconds"]:
+        return profile
+    rows = run_query("SELECT Profile_Version FROM STUDENT WHERE Student_ID=%s",
+                     (profile["Student_ID"],), ttl=0)
+    if not rows:
+        return None
+    if rows[0]["Profile_Version"] != profile.get("Profile_Version"):
+        rows = run_query("SELECT * FROM STUDENT WHERE Student_ID=%s", (profile["Student_ID"],), ttl=0)
+        if not rows:
+            return None
+        profile = rows[0]
+    return remember(profile)
+
+
+def update_profile(student_id, first_name, last_name, email, phone, cgpa, branch, backlogs, grad_year):
+    """Save the student's own edits, refresh their eligibility and the cached profile in one go."""
+    with transaction() as tx:
+        tx.execute(f"""
+            UPDATE STUDENT
+            SET First_Name=%s, Last_Name=%s, Email=%s, Phone=%s, CGPA=%s,
+                Branch=%s, Backlogs=%s, Graduation_Year=%s, {BUMP_VERSION}
+            WHERE Student_ID=%s
+        """, (first_name, last_name, email, phone, cgpa, branch, backlogs, grad_year, student_id))
+        # CGPA/branch/backlogs feed the eligibility matrix
+        refresh_students(tx, [student_id])
+        rows = tx.query("SELECT * FROM STUDENT WHERE Student_ID=%s", (student_id,))
+    return remember(rows[0]) if rows else None
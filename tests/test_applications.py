@@ -0,0 +1,72 @@
+# tests/test_applications.py - idempotency-key handling of submit_application (no MySQL needed)
+import contextlib
+
+import pytest
+from mysql.connector import errors
+
+import applications
+
+
+class FakeApplicationTable:
+    """APPLICATION with its two unique keys: (Student_ID, Job_ID) and Idempotency_Key."""
+
+    def __init__(self):
+        self.rows = []
+
+    def insert(self, student_id, job_id, key):
+        for row in self.rows:
+            if (row["Student_ID"], row["Job_ID"]) == (student_id, job_id) or (key and row["Idempotency_Key"] == key):
+                raise errors.IntegrityError(msg="Duplicate entry", errno=1062)
+        self.rows.append({"Student_ID": student_id, "Job_ID": job_id, "Idempotency_Key": key})
+
+
+class FakeTx:
+    def __init__(self, table):
+        self.table = table
+
+    def query(self, sql, params=None):
+        if "FROM JOB_POSTING j" in sql:
+            return [{"is_closed": 0, "is_full": 0}]
+        return [{"Student_ID": params[0]}]
+
+    def execute(self, sql, params=None):
+        if "INSERT INTO APPLICATION" in sql:
+            student_id, _cover, key, job_id = params
+            self.table.insert(student_id, job_id, key)
+        return 1
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeApplicationTable()
+
+    @contextlib.contextmanager
+    def transaction():
+        yield FakeTx(table)
+
+    def run_query(sql, params=None, ttl=None):
+        return [r for r in table.rows if r["Idempotency_Key"] == params[0]]
+
+    monkeypatch.setattr(applications, "transaction", transaction)
+    monkeypatch.setattr(applications, "run_query", run_query)
+    monkeypatch.setattr(applications.placement_summary, "refresh_students", lambda tx, ids: None)
+    return table
+
+
+def test_replayed_key_is_already_submitted(table):
+    assert applications.submit_application(1, 10, idempotency_key="k1") == applications.SUBMITTED
+    assert applications.submit_application(1, 10, idempotency_key="k1") == applications.ALREADY_SUBMITTED
+    assert len(table.rows) == 1
+
+
+def test_key_used_for_another_job_is_not_reported_as_submitted(table):
+    assert applications.submit_application(1, 10, idempotency_key="k1") == applications.SUBMITTED
+    assert applications.submit_application(1, 11, idempotency_key="k1") == applications.KEY_REUSED
+    assert applications.submit_application(1, 11, idempotency_key="k2") == applications.SUBMITTED
+    assert [r["Job_ID"] for r in table.rows] == [10, 11]
+
+
+def test_same_job_with_new_key_is_duplicate(table):
+    assert applications.submit_application(1, 10, idempotency_key="k1") == applications.SUBMITTED
+    assert applications.submit_application(1, 10, idempotency_key="k2") == applications.DUPLICATE
+    assert applications.submit_application(1, 10) == applications.DUPLICATE
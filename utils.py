@@ -5,6 +5,7 @@ def get_student_by_login(student_id, first_name, phone):
     rows = run_query(
         "SELECT * FROM STUDENT WHERE Student_ID=%s AND First_Name=%s AND Phone=%s",
         (student_id, first_name, phone),
+        ttl=0,
     )
     return rows[0] if rows else None
 
@@ -12,6 +13,7 @@ def get_officer_by_login(email, password):
     rows = run_query(
         "SELECT * FROM PLACEMENT_OFFICER WHERE Email=%s AND Password=%s",
         (email, password),
+        ttl=0,
     )
     return rows[0] if rows else None
 